@@ -7,6 +7,22 @@ endif
 
 DEFAULTS ?=
 REQUIREMENTS ?=
+CITATIONS ?= citeproc
+PROFILE ?=
+INDEX ?=
+TIMINGS ?=
+ASSETS ?=
+MINIFY ?=
+RESOURCE_CACHE ?=
+RESOURCE_CACHE_SIZE ?= 100
+CHECK_FORMAT ?= text
+BUNDLE ?=
+SREFS_EDITIONS ?=
+FORKSERVER ?=
+
+ifeq ($(filter $(CITATIONS),citeproc native),)
+$(error CITATIONS must be either 'citeproc' or 'native', got '$(CITATIONS)')
+endif
 
 override ROOTDIR := $(dir $(lastword $(MAKEFILE_LIST)))
 
@@ -23,27 +39,59 @@ export PATH := $(PANDOC_DIR):$(PYTHON_DIR)/bin:$(PATH)
 
 override define PANDOC
 $(eval override FILES := $(filter %.md, $^))
+$(eval override AST := $(filter %.diff.json, $^))
 $(eval override SUGGESTION := $(shell $(PYTHON_BIN) $(DATADIR)/suggest-target.py '$@'))
 $(if $(FILES),,$(error No Markdown input found for target '$@'$(if $(SUGGESTION),. $(SUGGESTION))))
-$(eval override CMD := pandoc $(DATADIR)/srefs.defs $(FILES) -o $@ --data-dir=$(DATADIR) -M data-dir=$(DATADIR) -d doc -d formatting)
+$(eval override CHUNKED := $(filter %/index.html, $@))
+$(eval override OUT := $(if $(CHUNKED),$(@D),$@))
+$(eval override CMD := pandoc $(or $(AST),$(DATADIR)/srefs.defs $(FILES)) -o $(OUT) --data-dir=$(DATADIR) -M data-dir=$(DATADIR) -d base $(if $(filter %.preview.html, $@),,-d citations-$(CITATIONS)) -d formatting)
 $(eval $(and $(DEFAULTS), override CMD += -d $(DEFAULTS)))
+$(eval $(and $(ASSETS), $(filter-out %.preview.html, $(filter %.html, $@)), override CMD += -d $(OUTDIR)/$(ASSETS)/defaults.yaml))
+$(eval $(and $(CHUNKED), override CMD += -d chunked $(if $(ASSETS),,-d $(OUTDIR)/$(ASSETSDIR)/defaults.yaml)))
+$(eval $(and $(filter %.preview.html, $@), override CMD += -d preview))
+$(eval $(and $(AST), override CMD += -f json))
+$(eval override SELF_CONTAINED := $(if $(filter %.html, $@),$(if $(or $(ASSETS),$(CHUNKED),$(filter %.preview.html, $@)),,1),1))
+$(eval $(and $(RESOURCE_CACHE), $(SELF_CONTAINED), override CMD += -M resource-cache=$(RESOURCE_CACHE) -M resource-cache-size=$(RESOURCE_CACHE_SIZE)))
+$(eval $(and $(CHUNKED), override CMD := $(PYTHON_BIN) $(DATADIR)/chunked.py $(OUT) $(CMD)))
+$(eval $(and $(TIMINGS), override CMD := $(PYTHON_BIN) $(DATADIR)/timings.py record $(TIMINGS) $(OUT) $(CMD)))
+$(eval $(and $(PROFILE), override CMD := WG21_PROFILE=$(OUT).profile.json $(CMD)))
+$(eval $(and $(INDEX), override CMD := WG21_INDEX=$(OUT).index.json $(CMD)))
+$(eval $(and $(FORKSERVER), override CMD := WG21_FORKSERVER=1 $(CMD)))
 $(if $(filter %.html, $@),
   $(eval override TOCDEPTH := $(shell $(PYTHON_BIN) $(DATADIR)/toc-depth.py < $(firstword $(FILES))))
   $(eval $(and $(TOCDEPTH), override CMD += --toc-depth $(TOCDEPTH))))
+$(eval $(and $(MINIFY), $(filter %.html, $@), override CMD += && $(PYTHON_BIN) $(DATADIR)/compress.py minify $(if $(CHUNKED),$(OUT)/*.html,$@)))
 $(CMD)
 endef
 
+override define CHECK
+$(eval override FILES := $(filter %.md, $^))
+$(if $(FILES),,$(error No Markdown input found for target '$@'))
+@$(and $(FORKSERVER),WG21_FORKSERVER=1 )$(PYTHON_BIN) $(DATADIR)/check.py $(if $(filter json, $(CHECK_FORMAT)),--json) pandoc $(DATADIR)/srefs.defs $(FILES) --data-dir=$(DATADIR) -M data-dir=$(DATADIR) -d base -d formatting $(and $(DEFAULTS),-d $(DEFAULTS)) -d check
+endef
+
 override SRCDEPS := $(addprefix $(DATADIR)/, \
 	csl/wg21.csl \
+	defaults/base.yaml \
+	defaults/citations-citeproc.yaml \
+	defaults/check.yaml \
+	defaults/chunked.yaml \
+	defaults/citations-native.yaml \
 	defaults/doc.yaml \
 	defaults/formatting.yaml \
-	filters/citetitle.py \
+	defaults/preview.yaml \
+	filters/citetitle.lua \
+	filters/forkserver.py \
+	filters/fragments.lua \
+	filters/pagetitle.lua \
+	filters/render.lua \
 	filters/wg21.py \
 	syntax/highlighting-css.yaml \
 	syntax/highlighting-macros.yaml \
 	syntax/wg21.theme \
 	syntax/wg21.xml \
 	templates/14882.css \
+	templates/wg21.chunkedhtml \
 	templates/wg21.css \
 	templates/wg21.html \
 	templates/wg21.latex \
@@ -53,9 +101,19 @@ override SRCDEPS := $(addprefix $(DATADIR)/, \
 	toc-depth.py)
 $(eval $(and $(DEFAULTS), override SRCDEPS += $(DEFAULTS)))
 
-override GENDEPS := $(PANDOC_DIR) $(PYTHON_DIR) $(addprefix $(DATADIR)/, csl.json srefs.json srefs.defs)
+override GENDEPS := $(PANDOC_DIR) $(PYTHON_DIR) $(addprefix $(DATADIR)/, csl.json csl.db srefs.json srefs.defs srefs.db suggest.db highlight-languages.txt)
 override DEPS := $(SRCDEPS) $(GENDEPS)
 
+# The chunked HTML output always links the assets, from `assets` by default.
+override ASSETSDIR := $(or $(ASSETS),assets)
+
+ifneq ($(ASSETS),)
+override DEPS += $(OUTDIR)/$(ASSETS)/defaults.yaml
+endif
+
+$(OUTDIR)/$(ASSETSDIR)/defaults.yaml: $(DATADIR)/assets.py $(addprefix $(DATADIR)/, defaults/base.yaml syntax/highlighting-css.yaml templates/14882.css templates/wg21.css favicon.ico) $(PYTHON_DIR)
+	$(PYTHON_BIN) $< $(DATADIR) $(@D) $(ASSETSDIR)
+
 $(SRCDEPS): ;
 
 $(PANDOC_DIR): $(DEPSDIR)/install-pandoc.sh
@@ -67,16 +125,56 @@ $(PYTHON_DIR): $(DEPSDIR)/install-venv.sh $(DEPSDIR)/requirements.txt $(REQUIREM
 $(DATADIR)/csl.json: $(DATADIR)/refs.py $(PYTHON_DIR)
 	set -e; trap 'rm -f "$@.tmp"' EXIT; $(PYTHON_BIN) $< > "$@.tmp"; mv "$@.tmp" "$@"; trap - EXIT
 
+$(DATADIR)/csl.db: $(DATADIR)/csl-db.py $(DATADIR)/csl.json $(PYTHON_DIR)
+	set -e; trap 'rm -f "$@.tmp"' EXIT; rm -f "$@.tmp"; $(PYTHON_BIN) $< $(DATADIR)/csl.json "$@.tmp"; mv "$@.tmp" "$@"; trap - EXIT
+
 $(DATADIR)/srefs.json: $(DATADIR)/srefs.py $(PYTHON_DIR)
 	set -e; trap 'rm -f "$@.tmp"' EXIT; $(PYTHON_BIN) $< > "$@.tmp"; mv "$@.tmp" "$@"; trap - EXIT
 
-$(DATADIR)/srefs.defs: $(DATADIR)/srefs-md.py $(DATADIR)/srefs.json $(PYTHON_DIR)
-	set -e; trap 'rm -f "$@.tmp"' EXIT; $(PYTHON_BIN) $< < $(DATADIR)/srefs.json > "$@.tmp"; mv "$@.tmp" "$@"; trap - EXIT
+$(DATADIR)/srefs.defs: $(DATADIR)/srefs-md.py $(DATADIR)/srefs.db $(PYTHON_DIR)
+	set -e; trap 'rm -f "$@.tmp"' EXIT; $(PYTHON_BIN) $< $(DATADIR)/srefs.db > "$@.tmp"; mv "$@.tmp" "$@"; trap - EXIT
+
+# The pinned editions of the working draft, only touched when they change, so
+# that `srefs.db` is only generated again then.
+$(DATADIR)/srefs.editions: FORCE
+	@echo '$(sort $(SREFS_EDITIONS))' | cmp -s - $@ || echo '$(sort $(SREFS_EDITIONS))' > $@
+
+$(DATADIR)/srefs.db: $(DATADIR)/srefs-db.py $(DATADIR)/srefs.json $(DATADIR)/srefs.editions $(foreach edition, $(SREFS_EDITIONS), $(word 2, $(subst =, , $(edition)))) $(PYTHON_DIR)
+	set -e; trap 'rm -f "$@.tmp"' EXIT; rm -f "$@.tmp"; $(PYTHON_BIN) $< $(DATADIR)/srefs.json "$@.tmp" "$@" $(SREFS_EDITIONS); mv "$@.tmp" "$@"; trap - EXIT
+
+$(DATADIR)/suggest.db: $(DATADIR)/suggest-db.py $(DATADIR)/srefs.db $(DATADIR)/csl.json $(PYTHON_DIR)
+	set -e; trap 'rm -f "$@.tmp"' EXIT; rm -f "$@.tmp"; $(PYTHON_BIN) $< $(DATADIR) "$@.tmp"; mv "$@.tmp" "$@"; trap - EXIT
+
+$(DATADIR)/lookup.db: $(DATADIR)/lookup.py $(DATADIR)/srefs.json $(DATADIR)/csl.json $(PYTHON_DIR)
+	set -e; trap 'rm -f "$@.tmp"' EXIT; rm -f "$@.tmp"; $(PYTHON_BIN) $< build $(DATADIR) "$@.tmp"; mv "$@.tmp" "$@"; trap - EXIT
+
+$(DATADIR)/highlight-languages.txt: $(DATADIR)/defaults/formatting.yaml $(DATADIR)/syntax/wg21.xml $(PANDOC_DIR)
+	set -e; trap 'rm -f "$@.tmp"' EXIT; pandoc --data-dir=$(DATADIR) -d formatting --list-highlight-languages > "$@.tmp"; mv "$@.tmp" "$@"; trap - EXIT
+
+.PHONY: timings
+timings: $(PYTHON_DIR)
+	$(if $(TIMINGS),,$(error Set TIMINGS to the file that the builds recorded their timings to))
+	@$(PYTHON_BIN) $(DATADIR)/timings.py summary $(TIMINGS)
+
+.PHONY: lookup
+lookup: $(DATADIR)/lookup.db
 
 .PHONY: distclean
 distclean:
-	rm -rf $(DEPSDIR)/pandoc $(DEPSDIR)/python $(GENDEPS)
+	rm -rf $(DEPSDIR)/pandoc $(DEPSDIR)/python $(GENDEPS) $(DATADIR)/srefs.editions $(DATADIR)/lookup.db $(DATADIR)/bundle.json
 
 .PHONY: update
 update:
-	@$(MAKE) -W $(DATADIR)/refs.py -W $(DATADIR)/srefs.py $(DATADIR)/csl.json $(DATADIR)/srefs.json $(DATADIR)/srefs.defs
+	@rm -f $(DATADIR)/bundle.json
+	@$(MAKE) -W $(DATADIR)/refs.py -W $(DATADIR)/srefs.py $(DATADIR)/csl.json $(DATADIR)/csl.db $(DATADIR)/srefs.json $(DATADIR)/srefs.defs $(DATADIR)/srefs.db $(DATADIR)/suggest.db $(DATADIR)/lookup.db
+
+# The databases of `make update` as a bundle named after their snapshot date,
+# to install elsewhere without network access, see `data/bundle.py`.
+.PHONY: bundle
+bundle: $(GENDEPS) $(DATADIR)/lookup.db
+	@$(PYTHON_BIN) $(DATADIR)/bundle.py pack $(DATADIR) .
+
+.PHONY: install-bundle
+install-bundle: $(PYTHON_DIR)
+	$(if $(BUNDLE),,$(error Set BUNDLE to the bundle to install, e.g. wg21-data-2026-06-01.tar.xz))
+	@$(PYTHON_BIN) $(DATADIR)/bundle.py install $(BUNDLE) $(DATADIR)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Write the assets shared by the HTML papers, with content-hashed names.
+
+Usage: assets.py DATADIR DIR HREF
+
+Writes the highlighting stylesheet from `syntax/highlighting-css.yaml`, the
+stylesheets listed in `defaults/base.yaml` and `favicon.ico` into DIR, named by
+a hash of their content, e.g. `wg21.1a2b3c4d5e.css`. Then writes the defaults
+file `DIR/defaults.yaml`, which turns off `self-contained` and links the assets
+from HREF, the path to DIR from the papers.
+
+Since the names change with the content, the assets can be cached forever.
+The assets of previous builds are left in place for the papers that link them.
+"""
+
+import hashlib
+import json
+import os
+import os.path
+import re
+import sys
+
+import yaml
+
+def write(directory, name, content):
+    """Writes `content` to `directory`, and returns its content-hashed name."""
+    stem, ext = os.path.splitext(name)
+    hashed = f'{stem}.{hashlib.sha256(content).hexdigest()[:10]}{ext}'
+    path = os.path.join(directory, hashed)
+    if not os.path.exists(path):
+        with open(f'{path}.tmp', 'wb') as f:
+            f.write(content)
+        os.replace(f'{path}.tmp', path)
+    return hashed
+
+def main():
+    datadir, directory, href = sys.argv[1:]
+    os.makedirs(directory, exist_ok=True)
+
+    # The highlighting stylesheet is inlined by the template via the
+    # `highlighting-css` metadata, as a raw HTML block.
+    with open(os.path.join(datadir, 'syntax', 'highlighting-css.yaml'), 'r') as f:
+        block, = yaml.safe_load(f)['highlighting-css']
+    highlighting = re.fullmatch(r'```\{=html\}\n(.*)```\n?', block, re.DOTALL).group(1)
+
+    with open(os.path.join(datadir, 'defaults', 'base.yaml'), 'r') as f:
+        stylesheets = yaml.safe_load(f)['css']
+
+    # Same order as the self-contained output: the `<style>` with the
+    # highlighting stylesheet comes before the linked stylesheets.
+    css = [write(directory, 'highlighting.css', highlighting.encode('utf-8'))]
+    for stylesheet in stylesheets:
+        with open(os.path.join(datadir, stylesheet), 'rb') as f:
+            css.append(write(directory, os.path.basename(stylesheet), f.read()))
+
+    with open(os.path.join(datadir, 'favicon.ico'), 'rb') as f:
+        favicon = write(directory, 'favicon.ico', f.read())
+
+    # JSON is valid YAML.
+    defaults = {
+        'self-contained': False,
+        'metadata': {
+            'assets': {
+                'css': [f'{href}/{name}' for name in css],
+                'favicon': f'{href}/{favicon}',
+            },
+            'highlighting-css': '',
+        },
+    }
+    with open(os.path.join(directory, 'defaults.yaml'), 'w') as f:
+        json.dump(defaults, f, indent=2)
+        f.write('\n')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Pack and install the databases of `make update` as a bundle.
+
+Usage: bundle.py pack DATADIR DST
+       bundle.py install BUNDLE DATADIR
+
+A bundle is an xz-compressed tarball of the databases that `make update`
+fetches and derives in DATADIR, see `FILES`, and a `manifest.json` first with
+the format of the bundle, the snapshot date of the databases and the SHA-256
+of each file.
+
+`pack` writes the bundle of DATADIR into the directory DST, named after the
+snapshot date, e.g. `wg21-data-2026-06-01.tar.xz`. The snapshot date is the
+one of the installed bundle if the databases are still the ones from it, and
+otherwise the date they were last fetched.
+
+`install` unpacks BUNDLE into DATADIR without network access. Every file is
+checked against the manifest before any is replaced, and the manifest is kept
+as `bundle.json` to tell which snapshot is installed. The files are dated now,
+so that make considers them up to date.
+"""
+
+import datetime
+import hashlib
+import io
+import json
+import os
+import os.path
+import sys
+import tarfile
+
+FORMAT = 1
+
+# In the order of `make update`, the derived databases after their sources.
+FILES = [
+    'csl.json', 'csl.db',
+    'srefs.json', 'srefs.defs', 'srefs.db',
+    'suggest.db', 'lookup.db',
+]
+
+def sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def snapshot(datadir, hashes):
+    """The date of the databases in `datadir`."""
+    installed = os.path.join(datadir, 'bundle.json')
+    if os.path.exists(installed):
+        with open(installed, 'r') as f:
+            manifest = json.load(f)
+        if all(manifest['files'].get(name) == hashes[name] for name in ('csl.json', 'srefs.json')):
+            return manifest['snapshot']
+    fetched = max(os.path.getmtime(os.path.join(datadir, name)) for name in ('csl.json', 'srefs.json'))
+    return datetime.date.fromtimestamp(fetched).isoformat()
+
+def pack(datadir, dst):
+    hashes = {name: sha256(os.path.join(datadir, name)) for name in FILES}
+    manifest = {'format': FORMAT, 'snapshot': snapshot(datadir, hashes), 'files': hashes}
+    path = os.path.join(dst, f'wg21-data-{manifest["snapshot"]}.tar.xz')
+
+    content = json.dumps(manifest, indent=2).encode('utf-8')
+    with tarfile.open(f'{path}.tmp', 'w:xz') as tar:
+        info = tarfile.TarInfo('manifest.json')
+        info.size = len(content)
+        tar.addfile(info, io.BytesIO(content))
+        for name in FILES:
+            tar.add(os.path.join(datadir, name), arcname=name)
+    os.replace(f'{path}.tmp', path)
+    print(f'bundle: packed snapshot {manifest["snapshot"]} into {path}')
+
+def install(bundle, datadir):
+    with tarfile.open(bundle, 'r:xz') as tar:
+        manifest = json.load(tar.extractfile('manifest.json'))
+        if manifest.get('format') != FORMAT:
+            sys.exit(f'bundle: {bundle} is in format {manifest.get("format")}, expected {FORMAT}')
+        if sorted(manifest['files']) != sorted(FILES):
+            sys.exit(f'bundle: {bundle} does not have the files {", ".join(FILES)}')
+
+        # Only the files of the manifest are read, by name, so that a bundle
+        # can't write anywhere else.
+        try:
+            for name in FILES:
+                digest = hashlib.sha256()
+                with tar.extractfile(name) as src, open(os.path.join(datadir, f'{name}.tmp'), 'wb') as dst:
+                    for chunk in iter(lambda: src.read(1 << 20), b''):
+                        digest.update(chunk)
+                        dst.write(chunk)
+                if digest.hexdigest() != manifest['files'][name]:
+                    sys.exit(f'bundle: {name} in {bundle} does not match its checksum')
+        except BaseException:
+            for name in FILES:
+                if os.path.exists(os.path.join(datadir, f'{name}.tmp')):
+                    os.remove(os.path.join(datadir, f'{name}.tmp'))
+            raise
+
+    for name in FILES:
+        os.replace(os.path.join(datadir, f'{name}.tmp'), os.path.join(datadir, name))
+        os.utime(os.path.join(datadir, name))
+    with open(os.path.join(datadir, 'bundle.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    print(f'bundle: installed snapshot {manifest["snapshot"]} into {datadir}')
+
+def main():
+    command, *args = sys.argv[1:]
+    if command == 'pack':
+        pack(*args)
+    elif command == 'install':
+        install(*args)
+    else:
+        sys.exit(f'bundle: unknown command {command}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Validate a paper without rendering it.
+
+Usage: check.py [--json] CMD...
+
+Runs the `pandoc` command CMD with `-d check`, in which `wg21.py` only runs its
+validations, e.g. for unknown stable names and citations, and reports each of
+them as a JSON diagnostic. Pandoc doesn't track source positions, so each one
+is located by its `needle`, the text it was written as in the Markdown files
+of CMD: the first occurrence after the previous diagnostic with the same
+needle. A list of needles is tried in order.
+
+Diagnostics are printed as `FILE:LINE:COLUMN: warning: MESSAGE`, or with
+`--json`, as JSON lines with `file`, `line`, `column`, `severity` and
+`message`. Exits with 1 if there are any.
+"""
+
+import json
+import subprocess
+import sys
+
+class Source:
+    def __init__(self, paths):
+        self.files = []
+        for path in paths:
+            with open(path, 'r') as f:
+                self.files.append((path, f.read()))
+        # The position after the previous occurrence of each needle.
+        self.cursors = {}
+
+    def locate(self, needles):
+        """
+        Returns the file, line and column of the next occurrence of the first
+        of `needles` that occurs.
+        """
+        for needle in needles if isinstance(needles, list) else [needles]:
+            if not needle:
+                continue
+            start = self.cursors.get(needle, (0, 0))
+            for i in range(start[0], len(self.files)):
+                path, text = self.files[i]
+                offset = text.find(needle, start[1] if i == start[0] else 0)
+                if offset >= 0:
+                    self.cursors[needle] = (i, offset + len(needle))
+                    line = text.count('\n', 0, offset) + 1
+                    column = offset - (text.rfind('\n', 0, offset) + 1) + 1
+                    return path, line, column
+        return self.files[0][0] if self.files else None, None, None
+
+def main():
+    args = sys.argv[1:]
+    as_json = args[:1] == ['--json']
+    cmd = args[1:] if as_json else args
+
+    source = Source([arg for arg in cmd if arg.endswith('.md')])
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+    diagnostics = []
+    for line in proc.stderr.splitlines(keepends=True):
+        if not line.startswith('{'):
+            sys.stderr.write(line)
+            continue
+        diagnostic = json.loads(line)
+        path, lineno, column = source.locate(diagnostic['needle'])
+        diagnostics.append({
+            'file': path,
+            'line': lineno,
+            'column': column,
+            'severity': 'warning',
+            'message': diagnostic['message'],
+        })
+
+    # In the order of the source, rather than of the validations.
+    order = {path: i for i, (path, _) in enumerate(source.files)}
+    diagnostics.sort(key=lambda d: (order.get(d['file'], 0), d['line'] or 0, d['column'] or 0))
+    for d in diagnostics:
+        if as_json:
+            print(json.dumps(d))
+        else:
+            position = ''.join(f':{n}' for n in [d['line'], d['column']] if n is not None)
+            print(f'{d["file"]}{position}: {d["severity"]}: {d["message"]}')
+
+    if proc.returncode != 0:
+        sys.exit(proc.returncode)
+    if diagnostics:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
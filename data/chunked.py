@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Build a chunked HTML paper into a directory, and fix up the links between its
+pages.
+
+Usage: chunked.py DIR CMD...
+
+Runs the `pandoc` command CMD with the `chunkedhtml` writer into a temporary
+directory next to DIR, since Pandoc only writes into a new directory. The pages
+are then moved into DIR in place of the ones of the previous build, as listed
+by `generated.py`. Nothing else in DIR is removed, and a DIR that the build
+didn't write isn't written into.
+
+Pandoc's `chunkedhtml` writer rewrites the links to an anchor in another page,
+e.g. `#pnum-3` to `2-wording.html#pnum-3`, but only in `Link` elements. The
+links that `wg21.py` renders as raw HTML, such as the ones in code, are left
+pointing into the current page. This points each of them to the page that has
+the anchor.
+
+It also removes the self-links of the headings from the navigation links to
+the previous and next pages, which show the headings' titles, as links can't
+be nested.
+"""
+
+import os
+import os.path
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import generated
+
+id_re = re.compile(r'\sid="([^"]+)"')
+href_re = re.compile(r'href="#([^"]+)"')
+nav_re = re.compile(r'<nav id="sitenav">.*?</nav>', re.DOTALL)
+self_link_re = re.compile(r'<a href="[^"]*" class="self-link"></a>')
+
+def fix_links(directory):
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.html'):
+            with open(os.path.join(directory, name), 'r') as f:
+                pages[name] = f.read()
+
+    anchors = {}
+    for name, html in pages.items():
+        for anchor in id_re.findall(html):
+            anchors.setdefault(anchor, name)
+
+    for name, html in pages.items():
+        local = set(id_re.findall(html))
+        def link(match):
+            anchor = match.group(1)
+            if anchor in local or anchor not in anchors:
+                return match.group()
+            return f'href="{anchors[anchor]}#{anchor}"'
+        fixed = href_re.sub(link, html)
+        fixed = nav_re.sub(lambda m: self_link_re.sub('', m.group()), fixed)
+        if fixed != html:
+            path = os.path.join(directory, name)
+            with open(f'{path}.tmp', 'w') as f:
+                f.write(fixed)
+            os.replace(f'{path}.tmp', path)
+
+def main():
+    directory, *cmd = sys.argv[1:]
+    directory = os.path.normpath(directory)
+    parent = os.path.dirname(directory) or os.curdir
+    os.makedirs(parent, exist_ok=True)
+    # A new name next to DIR, for the links to the assets to be the same, and
+    # without an extension, which Pandoc would write a `.zip` file for.
+    tmp = tempfile.mkdtemp(prefix=f'{os.path.basename(directory)}-', dir=parent)
+    os.rmdir(tmp)
+    try:
+        returncode = subprocess.run([*cmd, '-o', tmp]).returncode
+        if returncode != 0:
+            sys.exit(returncode)
+        fix_links(tmp)
+        generated.install(tmp, directory)
+    except FileExistsError as e:
+        sys.exit(f'chunked: {e}')
+    finally:
+        if os.path.isdir(tmp):
+            shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    main()
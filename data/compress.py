@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Minify and precompress the HTML output for deployment.
+
+Usage: compress.py minify FILE...
+       compress.py gzip FILE...
+       compress.py brotli FILE...
+
+`minify` rewrites the HTML in each FILE in place. It only removes what the browser
+ignores: comments, whitespace between block-level tags, and runs of whitespace
+elsewhere, which are collapsed to a single space. The stylesheets in `style`
+elements lose their comments and insignificant whitespace. The content of
+`pre`, `code`, `textarea` and `script` elements and the values of attributes,
+such as anchor ids, are left as they are.
+
+`gzip` and `brotli` write FILE.gz and FILE.br, compressed at the highest
+level, for servers that serve precompressed files.
+
+Each command reports the size of each FILE before and after.
+"""
+
+import os
+import re
+import sys
+
+# Elements whose whitespace is significant.
+preserved = {'pre', 'code', 'textarea'}
+# Elements whose content isn't HTML.
+raw_text = {'script', 'style'}
+
+# Elements that whitespace between doesn't render, as they aren't inline.
+# Not `div`, which the stylesheets and the papers may make inline, e.g.
+# `div.sentence` in `14882.css`, so the whitespace next to it is collapsed to a
+# single space like elsewhere.
+blocks = {
+    'address', 'article', 'aside', 'blockquote', 'body', 'caption', 'col',
+    'colgroup', 'dd', 'details', 'dl', 'dt', 'fieldset', 'figcaption',
+    'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'head',
+    'header', 'hr', 'html', 'li', 'link', 'main', 'meta', 'nav', 'ol', 'p',
+    'section', 'summary', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead',
+    'title', 'tr', 'ul', '!doctype'}
+
+token_re = re.compile(r'<!--.*?-->|<[^>]*>|[^<]+|<', re.DOTALL)
+tag_re = re.compile(r'</?([!\w-]+)')
+# Whitespace within a tag, outside of the quoted attribute values.
+tag_space_re = re.compile(r'("[^"]*"|\'[^\']*\')|([ \t\n\r\f]+)(?=>$)|[ \t\n\r\f]+')
+# Not `\s`, which includes non-breaking spaces.
+space_re = re.compile(r'[ \t\n\r\f]+')
+# Comments, and whitespace that is insignificant in CSS, outside of strings.
+css_re = re.compile(
+    r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')|/\*.*?\*/|'
+    r'[ \t\n\r\f]*([{};,>])[ \t\n\r\f]*|([ \t\n\r\f]+)', re.DOTALL)
+
+def minify_css(css):
+    return css_re.sub(
+        lambda m: m.group(1) or m.group(2) or (' ' if m.group(3) else ''), css).strip()
+
+def minify(html):
+    pieces = []
+    depth = 0  # Of the elements in `preserved`.
+    pos = 0
+    while pos < len(html):
+        match = token_re.match(html, pos)
+        token = match.group()
+        pos = match.end()
+
+        if token.startswith('<!--'):
+            continue
+
+        if (tag := tag_re.match(token)) is not None:
+            name = tag.group(1).lower()
+            closing = token.startswith('</')
+            token = tag_space_re.sub(
+                lambda m: m.group(1) or ('' if m.group(2) else ' '), token)
+            pieces.append(token)
+            if name in raw_text and not closing:
+                # The content of raw text elements can contain `<`.
+                end = html.lower().find(f'</{name}', pos)
+                end = len(html) if end < 0 else end
+                content = html[pos:end]
+                pieces.append(minify_css(content) if name == 'style' else content)
+                pos = end
+            elif name in preserved and not token.endswith('/>'):
+                depth += -1 if closing else 1
+            continue
+
+        if depth > 0:
+            pieces.append(token)
+            continue
+
+        text = space_re.sub(' ', token)
+        if text == ' ':
+            # Whitespace next to a block-level tag doesn't render.
+            prev = tag_re.match(pieces[-1]) if pieces else None
+            following = tag_re.match(html, pos)
+            if ((prev is not None and prev.group(1).lower() in blocks) or
+                (following is not None and following.group(1).lower() in blocks)):
+                continue
+        pieces.append(text)
+
+    return ''.join(pieces)
+
+def report(path, before, after, what):
+    saved = (before - after) / before * 100 if before else 0
+    print(f'{path}: {before} -> {after} bytes {what} (-{saved:.0f}%)')
+
+def run(command, path):
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    if command == 'minify':
+        minified = minify(content.decode('utf-8')).encode('utf-8')
+        with open(f'{path}.tmp', 'wb') as f:
+            f.write(minified)
+        os.replace(f'{path}.tmp', path)
+        report(path, len(content), len(minified), 'minified')
+    elif command == 'gzip':
+        import gzip
+        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+        with open(f'{path}.gz', 'wb') as f:
+            f.write(compressed)
+        report(path, len(content), len(compressed), 'gzip')
+    elif command == 'brotli':
+        import brotli
+        compressed = brotli.compress(content, quality=11)
+        with open(f'{path}.br', 'wb') as f:
+            f.write(compressed)
+        report(path, len(content), len(compressed), 'brotli')
+    else:
+        sys.exit(f'Unknown command: {command}')
+
+def main():
+    command, *paths = sys.argv[1:]
+    for path in paths:
+        run(command, path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""Generate an indexed reference store (SQLite) from csl.json."""
+
+import json
+import sqlite3
+import sys
+
+def main():
+    src, dst = sys.argv[1:]
+
+    with open(src, 'r') as f:
+        items = json.load(f)
+
+    db = sqlite3.connect(dst)
+    with db:
+        db.execute('CREATE TABLE refs (id TEXT PRIMARY KEY, item TEXT NOT NULL) WITHOUT ROWID')
+        db.executemany(
+            'INSERT OR IGNORE INTO refs VALUES (?, ?)',
+            ((item['id'], json.dumps(item, ensure_ascii=False, separators=(',', ':')))
+             for item in items))
+    db.close()
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,15 @@
-#!/usr/bin/env python3
-
-# MPark.WG21
-#
-# Copyright Michael Park, 2025
-#
-# Distributed under the Boost Software License, Version 1.0.
-# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
-
-import panflute as pf
-
-"""
+-- MPark.WG21
+--
+-- Copyright Michael Park, 2025
+--
+-- Distributed under the Boost Software License, Version 1.0.
+-- (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+--[[
 This filter is separate from `wg21.py` because it needs to run before `citeproc`.
 `wg21.py` currently needs to run after `citeproc` due to `citation_link` (maybe others too).
+It is a Lua filter so that it runs inside the Pandoc process, rather than paying
+for a second Python interpreter startup and JSON round trip of the AST per build.
 
 The mechanism is a bit convoluted, but basically... `wg21.csl` is the CSL definition
 that determines how references are handled and rendered. The logic there is to optionally
@@ -22,21 +20,22 @@ So, for example `[@Pxxxx]` is a citation without a locator, whereas `[@Pxxxx, 1]
 is a citation with a locator. The locator value is ignored by the CSL layout; its
 presence is sufficient to inject the title. However, since this syntax is rather
 unfamiliar and cryptic, we offer `[@Pxxxx]{.title}` instead.
-"""
-
-def citetitle(elem, doc):
-    if not (
-        isinstance(elem, pf.Span) and
-        elem.classes == ['title'] and
-        len(elem.content) == 1 and
-        isinstance(elem.content[0], pf.Cite)
-    ):
-        return None
-
-    for citation in elem.content[0].citations:
-        citation.suffix.extend([pf.Str(','), pf.Space, pf.Str('1')])
-
-    return elem
-
-if __name__ == '__main__':
-    pf.run_filter(citetitle)
+]]
+
+function Span(elem)
+  if not (
+    #elem.classes == 1 and elem.classes[1] == 'title' and
+    #elem.content == 1 and elem.content[1].t == 'Cite'
+  ) then
+    return nil
+  end
+
+  local cite = elem.content[1]
+  local citations = cite.citations
+  for _, citation in ipairs(citations) do
+    citation.suffix:extend({pandoc.Str(','), pandoc.Space(), pandoc.Str('1')})
+  end
+  cite.citations = citations
+  elem.content = {cite}
+  return elem
+end
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+A fork server for `wg21.py`, enabled by `FORKSERVER` in `flat.mk`.
+
+Usage: forkserver.py serve SCRIPT
+       forkserver.py status SCRIPT
+       forkserver.py stop SCRIPT
+
+Pandoc starts `wg21.py` in a fresh interpreter for every build, which spends
+most of its time importing `panflute` and the rest before it gets to the paper.
+With `WG21_FORKSERVER` set, `wg21.py` is a thin client instead, see `client`:
+it hands its arguments, its environment, its working directory and its stdin,
+stdout and stderr to the server of the current user for the same interpreter
+and the same `wg21.py`. The server has all of that imported and `wg21.py`
+compiled already, and forks a child per build that runs `wg21.py` in fresh
+globals as if it were started by Pandoc, and reports its exit status back.
+Only the imports and the compiled `wg21.py` are shared by the builds, nothing
+that a build does is kept for the next one.
+
+  - The first client that finds no server starts one in the background, and
+    runs `wg21.py` itself. So do the clients that fail to hand a build off.
+  - The server exits once it's been idle for `WG21_FORKSERVER_IDLE` seconds
+    (default: 600), or on `stop`.
+  - The server is found by the modification times of `wg21.py` and of this
+    file, so a server for an older `wg21.py` is never used, and idles out.
+
+The SQLite databases aren't opened by the server, since a connection can't be
+shared by the processes forked after it's opened. Each child opens them again,
+which is cheap next to the imports.
+"""
+
+import json
+import os
+import socket
+import struct
+import sys
+
+IDLE = 600
+
+# The modules that `wg21.py` imports, also lazily, that are worth having warm.
+PRELOAD = [
+    'panflute', 'yaml', 'orjson', 'sqlite3', 'concurrent.futures', 'contextlib',
+    'datetime', 'difflib', 'functools', 'hashlib', 'html', 'importlib.util',
+    'mimetypes', 'tempfile', 'urllib.request', 'uuid',
+]
+
+def rundir():
+    """The directory of the sockets of the current user, private to them."""
+    base = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp'
+    path = os.path.join(base, f'wg21-forkserver-{os.getuid()}')
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    stat = os.lstat(path)
+    if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+        raise PermissionError(f'forkserver: {path} is not private to the current user')
+    return path
+
+def address(script):
+    import hashlib
+    key = [os.path.normpath(os.path.abspath(sys.executable))]
+    for path in (script, __file__):
+        stat = os.stat(path)
+        key += [os.path.realpath(path), str(stat.st_mtime_ns), str(stat.st_size)]
+    digest = hashlib.blake2b('\0'.join(key).encode('utf-8'), digest_size=8).hexdigest()
+    return os.path.join(rundir(), f'{digest}.sock')
+
+def recv_exactly(conn, n):
+    data = b''
+    while len(data) < n:
+        chunk = conn.recv(n - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+def start(script):
+    """Starts the server for `script` in the background."""
+    import subprocess
+    env = {k: v for k, v in os.environ.items() if not k.startswith('WG21_') or k == 'WG21_FORKSERVER_IDLE'}
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), 'serve', os.path.abspath(script)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        env=env, start_new_session=True)
+
+def client(script):
+    """
+    Hands the build to the server for `script` and exits with its status, or
+    returns for `script` to run in this process.
+    """
+    try:
+        path = address(script)
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    except (AttributeError, OSError):
+        return
+    with conn:
+        try:
+            conn.connect(path)
+        except OSError:
+            try:
+                start(script)
+            except OSError:
+                pass
+            return
+
+        request = json.dumps({
+            'argv': sys.argv, 'cwd': os.getcwd(), 'env': dict(os.environ),
+        }).encode('utf-8')
+        try:
+            socket.send_fds(conn, [struct.pack('!I', len(request)) + request], [0, 1, 2])
+            # The child acknowledges before it touches stdin, so until then
+            # the build can still run here.
+            if recv_exactly(conn, 1) != b'\1':
+                return
+        except OSError:
+            return
+
+        status = recv_exactly(conn, 4)
+    if len(status) != 4:
+        sys.stderr.write('forkserver: wg21.py exited abnormally\n')
+        sys.exit(1)
+    sys.exit(struct.unpack('!i', status)[0])
+
+def child(conn, code, script):
+    """Runs the build of the request on `conn`, in the forked child."""
+    import signal
+    import traceback
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    data, fds, _, _ = socket.recv_fds(conn, 1 << 16, 3)
+    if len(fds) != 3 or len(data) < 4:
+        os._exit(1)
+    size, = struct.unpack('!I', data[:4])
+    request = json.loads(data[4:] + recv_exactly(conn, size - len(data) + 4))
+    for fd, target in zip(fds, (0, 1, 2)):
+        os.dup2(fd, target)
+        os.close(fd)
+
+    os.chdir(request['cwd'])
+    request['env'].pop('WG21_FORKSERVER', None)
+    os.environ.clear()
+    os.environ.update(request['env'])
+    sys.argv = request['argv']
+    conn.sendall(b'\1')
+
+    status = 0
+    try:
+        exec(code, {'__name__': '__main__', '__file__': script, '__builtins__': __builtins__})
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            status = e.code or 0
+        else:
+            sys.stderr.write(f'{e.code}\n')
+            status = 1
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    except OSError:
+        status = status or 1
+    conn.sendall(struct.pack('!i', status))
+    os._exit(status)
+
+def serve(script):
+    import fcntl
+    import importlib
+    import signal
+
+    path = address(script)
+    # Not truncated until it's locked, for `stop` to find the server that has it.
+    lock = open(os.open(f'{path}.lock', os.O_RDWR | os.O_CREAT, 0o600), 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return  # Another client started it first.
+    lock.truncate()
+    lock.write(f'{os.getpid()}\n')
+    lock.flush()
+
+    for name in PRELOAD:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    with open(script, 'r', encoding='utf-8') as f:
+        code = compile(f.read(), script, 'exec')
+    # Only the definitions run, not as `__main__`, for the regular expressions
+    # they compile to be cached for the children.
+    exec(code, {'__name__': 'wg21', '__file__': script})
+
+    if os.path.exists(path):
+        os.remove(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(64)
+    server.settimeout(float(os.environ.get('WG21_FORKSERVER_IDLE', IDLE)))
+
+    # The children report to the clients, and are reaped automatically.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            conn.settimeout(None)
+            if os.fork() == 0:
+                server.close()
+                lock.close()
+                child(conn, code, script)
+            conn.close()
+    finally:
+        for leftover in (path, f'{path}.lock'):
+            try:
+                os.remove(leftover)
+            except OSError:
+                pass
+
+def server_pid(script):
+    """The process id of the server for `script`, or `None`."""
+    try:
+        with open(f'{address(script)}.lock', 'r') as f:
+            pid = int(f.read())
+        os.kill(pid, 0)
+        return pid
+    except (OSError, ValueError):
+        return None
+
+def status(script):
+    pid = server_pid(script)
+    if pid is None:
+        sys.exit(f'forkserver: no server for {script}')
+    print(f'forkserver: serving {script} as process {pid}')
+
+def stop(script):
+    import signal
+    pid = server_pid(script)
+    if pid is not None:
+        os.kill(pid, signal.SIGTERM)
+
+def main():
+    command, script = sys.argv[1:]
+    if command == 'serve':
+        serve(script)
+    elif command == 'status':
+        status(script)
+    elif command == 'stop':
+        stop(script)
+    else:
+        sys.exit(f'forkserver: unknown command {command}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+-- MPark.WG21
+--
+-- Copyright Michael Park, 2026
+--
+-- Distributed under the Boost Software License, Version 1.0.
+-- (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+--[[
+Parse the fragments of `convert_fragments` in `wg21.py` at every depth, in the
+one Pandoc invocation that reads them.
+
+The new text of `[old text](new text){.sub}` is itself a fragment, which may
+have substitutions of its own, and the fragments of the embedded Markdown in
+code elements, e.g. `@[`x`]{.add}@`, may have code elements with embedded
+Markdown of their own. `wg21.py` used to convert each depth with another
+`pandoc`. Here, each one is parsed with `pandoc.read` as it's found instead:
+
+  - The substitutions are turned into `[old text]{.rm}[new text]{.add}`, as
+    `process_subs` does. The ones whose URL isn't certain to decode the same
+    way, e.g. with HTML entities, are left for `process_subs`.
+  - With `fragments-embedded` set, the fragments of the code elements are
+    found as `CodeElems` finds them, with their delimiters `md` and `em`, or
+    `fragments-md` and `fragments-em`, the defaults of `wg21.py`. They're
+    parsed and added as a second list after the list of the fragments, each
+    item marked with its fragment as `fragment`. They're a superset of the
+    ones `CodeElems` needs, which only misses the ones with other delimiters,
+    and converts those with another `pandoc`.
+
+The fragments are read with `fragments-from`, the format of `convert_fragments`.
+`tests/nesting/fragments.py` checks that `split` and `unquote` agree with
+`wg21.py`.
+]]
+
+local from
+local embedded
+local defaults = {}
+local found = {}
+local queue = {}
+
+-- The new text of a substitution, as `process_subs` decodes it with
+-- `html.unescape(urllib.parse.unquote(url))`, or `nil` if unsure.
+local function unquote(url)
+  local text = url:gsub('%%(%x%x)', function(hex)
+    return string.char(tonumber(hex, 16))
+  end)
+  if text:find('&[#%w]') or not utf8.len(text) then
+    return nil
+  end
+  return text
+end
+
+-- The fragments of `text` with the delimiters `md` and `em`, as
+-- `CodeElems._replace_fragments_with_placeholders` finds them.
+local function split(text, md, em)
+  local fragments = {}
+  local function fragment(i, closing, wrap)
+    local stop = text:find(closing, i, true)
+    local newline = text:find('\n', i, true)
+    if stop == nil or (newline ~= nil and newline < stop) then
+      return nil
+    end
+    table.insert(fragments, wrap(text:sub(i, stop - 1)))
+    return stop + #closing
+  end
+
+  local function same(fragment) return fragment end
+  local i = 1
+  while i <= #text do
+    local j
+    if md ~= nil and text:sub(i, i + 2 * #md - 1) == md:rep(2) then
+      j = fragment(i + 2 * #md, md:rep(2), same)
+    elseif md ~= nil and text:sub(i, i + #md - 1) == md then
+      j = fragment(i + #md, md, same)
+    elseif em ~= nil and text:sub(i, i + #em - 1) == em then
+      j = fragment(i + #em, em, function(fragment) return '*' .. fragment .. '*' end)
+    end
+    i = j or i + 1
+  end
+  return fragments
+end
+
+local parse
+
+local function sub(link)
+  if not link.classes:includes('sub') then
+    return nil
+  end
+  local text = unquote(link.target)
+  local new = text and parse(text)
+  if new == nil then
+    return nil
+  end
+  new:remove(1)
+  local classes = link.classes:filter(function(c) return c ~= 'sub' end)
+  local rm = pandoc.Span(link.content, pandoc.Attr('', {'rm', table.unpack(classes)}))
+  local add = pandoc.Span(new, pandoc.Attr('', {'add', table.unpack(classes)}))
+  return pandoc.Span({rm, add})
+end
+
+local function code(elem)
+  local md = elem.attributes.md or (not elem.classes:includes('raw') and defaults.md or nil)
+  local em = elem.attributes.em or (not elem.classes:includes('raw') and defaults.em or nil)
+  for _, fragment in ipairs(split(elem.text, md ~= 'none' and md or nil, em ~= 'none' and em or nil)) do
+    if found[fragment] == nil then
+      found[fragment] = true
+      table.insert(queue, fragment)
+    end
+  end
+end
+
+local filter = {Link = sub}
+
+-- The inlines of `text` as the item of `- []{}text`, as `convert_fragments`
+-- reads it, with its own fragments handled, or `nil` if it isn't one item.
+-- The first inline is the marker `[]{}`.
+parse = function(text)
+  local blocks = pandoc.read('- []{}' .. text, from).blocks
+  local list = blocks[1]
+  if #blocks ~= 1 or list.t ~= 'BulletList' or #list.content ~= 1 then
+    return nil
+  end
+  local item = list.content[1]
+  if #item ~= 1 or item[1].t ~= 'Plain' then
+    return nil
+  end
+  local marker = item[1].content[1]
+  if marker == nil or marker.t ~= 'Span' or #marker.content ~= 0 then
+    return nil
+  end
+  return item[1].content:walk(filter)
+end
+
+function Pandoc(doc)
+  from = pandoc.utils.stringify(doc.meta['fragments-from'])
+  embedded = doc.meta['fragments-embedded'] == true
+  defaults.md = doc.meta['fragments-md'] and pandoc.utils.stringify(doc.meta['fragments-md'])
+  defaults.em = doc.meta['fragments-em'] and pandoc.utils.stringify(doc.meta['fragments-em'])
+  if embedded then
+    filter.Code = code
+    filter.CodeBlock = code
+  end
+
+  doc.blocks = doc.blocks:walk(filter)
+  if not embedded then
+    return doc
+  end
+
+  -- The fragments that the ones so far embed, breadth first.
+  local items = {}
+  local i = 1
+  while i <= #queue do
+    local inlines = parse(queue[i])
+    if inlines ~= nil then
+      inlines[1].attributes.fragment = queue[i]
+      table.insert(items, {pandoc.Plain(inlines)})
+    end
+    i = i + 1
+  end
+  if #items > 0 then
+    doc.blocks:insert(pandoc.BulletList(items))
+  end
+  return doc
+end
@@ -0,0 +1,27 @@
+-- MPark.WG21
+--
+-- Copyright Michael Park, 2026
+--
+-- Distributed under the Boost Software License, Version 1.0.
+-- (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+--[[
+Sets `pagetitle` (HTML) and `title-meta` (PDF) to the title as plain Markdown.
+
+This used to be done in `wg21.py`'s `prepare` via `pf.convert_text`, which costs
+a `pandoc` subprocess on every build, even for an empty paper. As a Lua filter,
+the conversion happens inside the Pandoc process. It runs right before `wg21.py`
+so that it sees the same title as `wg21.py` did.
+]]
+
+function Meta(meta)
+  if meta.title == nil then
+    return nil
+  end
+
+  local title = pandoc.write(pandoc.Pandoc({pandoc.Plain(meta.title)}), 'markdown')
+  title = title:gsub('\n$', '')
+  meta.pagetitle = title
+  meta['title-meta'] = title
+  return meta
+end
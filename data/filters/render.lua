@@ -0,0 +1,187 @@
+-- MPark.WG21
+--
+-- Copyright Michael Park, 2026
+--
+-- Distributed under the Boost Software License, Version 1.0.
+-- (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+--[[
+Render Markdown examples as source/output tables.
+
+Usage:
+
+  Single example, yields a single-column table.
+  "Markdown Source" on the top, "Rendered Output" on the bottom.
+
+  ```render
+  Modify section [format.functions]{.sref}
+  ```
+
+  Multiple examples, yields a two-column table.
+  "Markdown Source" on the left, "Rendered Output" on the right.
+  Each inline code and code block become the rows.
+
+  ::: render
+  `` `auto x = 42;`{.cpp}``
+
+  ``````
+  ```cpp
+  int main() {
+    return 0;
+  }
+  ```
+  ``````
+  :::
+
+This used to be a Markdown-to-Markdown prepass, `render.py`, that wrote the
+whole paper back out as Markdown with the rendered side as raw Markdown, for
+the normal pipeline to parse again. As a Lua filter that runs first, only the
+examples are written and parsed again, inside the Pandoc process, and a paper
+without any is left as it was read. The examples are parsed with the
+extensions of the reader, after what they need of the paper to be parsed as
+part of it: the link definitions of the input files that they may use, e.g.
+the stable names of `srefs.defs`, and the headings of the paper, for the
+implicit references to them and for the headings of the examples to get
+identifiers that the paper hasn't taken.
+
+Unlike with the prepass, the rest of the paper isn't rewrapped in between.
+An abbreviation at the end of a line, e.g. "e.g.", is followed by a line
+break as written, rather than by the non-breaking space that the reader only
+gives it within a line.
+]]
+
+local function normalize(key)
+  return (key:lower():gsub('%s+', ' '))
+end
+
+-- The link definitions of the input files for the normalized `keys`, as the
+-- lines that the reader reads them from, the first of each key.
+local function definitions(keys)
+  local lines = {}
+  for _, path in ipairs(PANDOC_STATE.input_files) do
+    local f = io.open(path, 'r')
+    if f ~= nil then
+      local text = '\n' .. f:read('a')
+      f:close()
+      local folded = text:lower()
+      for key in pairs(keys) do
+        local start = folded:find('\n[' .. key .. ']:', 1, true)
+        if start ~= nil then
+          local stop = text:find('\n', start + 1, true) or #text + 1
+          table.insert(lines, text:sub(start + 1, stop - 1))
+          keys[key] = nil
+        end
+      end
+    end
+  end
+  return lines
+end
+
+local function cell(text)
+  return pandoc.Cell({pandoc.Plain({pandoc.Str(text)})}, 'AlignCenter')
+end
+
+local function raw(elem)
+  elem.classes:insert(1, 'default')
+  elem.classes:insert(1, 'raw')
+  return elem
+end
+
+-- The blocks of the example `elem` as `render.py` wrote them, or `nil`.
+local function render(elem)
+  if elem.t == 'CodeBlock' then
+    local text = elem.text
+    elem.classes = elem.classes:filter(function(c) return c ~= 'render' end)
+    return pandoc.BlockQuote({
+      pandoc.Plain({pandoc.Strong({pandoc.Str('Markdown Source')})}),
+      raw(elem),
+      pandoc.Plain({pandoc.Strong({pandoc.Str('Rendered Output')})}),
+      pandoc.Div({pandoc.RawBlock('markdown', text)}),
+    })
+  end
+
+  local rows = {}
+  elem:walk({
+    traverse = 'topdown',
+    Code = function(code)
+      local text = code.text
+      table.insert(rows, pandoc.Row({
+        pandoc.Cell({pandoc.Plain({raw(code)})}),
+        pandoc.Cell({pandoc.RawBlock('markdown', text)}),
+      }))
+    end,
+    CodeBlock = function(block)
+      local text = block.text
+      table.insert(rows, pandoc.Row({
+        pandoc.Cell({raw(block)}),
+        pandoc.Cell({pandoc.Div({pandoc.RawBlock('markdown', text)})}),
+      }))
+    end,
+  })
+
+  if #rows == 0 then
+    return nil
+  end
+
+  local colspec = {'AlignDefault', 'ColWidthDefault'}
+  return pandoc.Table(
+    {long = {}},
+    {colspec, colspec},
+    pandoc.TableHead({pandoc.Row({cell('Markdown Source'), cell('Rendered Output')})}),
+    {{attr = pandoc.Attr(), body = rows, head = {}, row_head_columns = 0}},
+    pandoc.TableFoot())
+end
+
+function Pandoc(doc)
+  -- Each example in place of `elem` for now, an empty div with its number.
+  local examples = {}
+  local function collect(elem)
+    local example = elem.classes:includes('render') and render(elem)
+    if example then
+      table.insert(examples, example)
+      return pandoc.Div({}, {['wg21-render'] = tostring(#examples)})
+    end
+  end
+
+  doc = doc:walk({CodeBlock = collect, Div = collect})
+  if #examples == 0 then
+    return nil
+  end
+
+  -- The headings of the paper, with their identifiers, and the link
+  -- definitions, before each example in a div with its number.
+  local headings = {}
+  doc:walk({
+    Header = function(header)
+      if header.identifier ~= '' then
+        table.insert(headings, header)
+      end
+    end,
+  })
+  local texts, keys = {}, {}
+  for i, example in ipairs(examples) do
+    local text = pandoc.write(pandoc.Pandoc({example}), 'markdown')
+    for key in text:gmatch('%[([^%[%]]+)%]') do
+      keys[normalize(key)] = true
+    end
+    table.insert(texts, '::: {wg21-render=' .. i .. '}\n' .. text .. '\n:::')
+  end
+  table.insert(texts, 1, pandoc.write(pandoc.Pandoc(headings), 'markdown'))
+  table.insert(texts, 1, table.concat(definitions(keys), '\n'))
+  local format = {format = 'markdown', extensions = PANDOC_READER_OPTIONS.extensions}
+  local parsed = {}
+  for _, block in ipairs(pandoc.read(table.concat(texts, '\n\n'), format, PANDOC_READER_OPTIONS).blocks) do
+    if block.t == 'Div' and block.attributes['wg21-render'] ~= nil then
+      parsed[block.attributes['wg21-render']] = block.content
+    end
+  end
+
+  return doc:walk({
+    Div = function(elem)
+      local blocks = parsed[elem.attributes['wg21-render']]
+      if blocks ~= nil and #elem.content == 0 then
+        return blocks
+      end
+    end,
+  })
+end
@@ -9,22 +9,422 @@
 
 import os.path
 import json
+
+if __name__ == '__main__' and os.environ.get('WG21_FORKSERVER'):
+    # Hand the build to the fork server, if there's one, see `forkserver.py`.
+    import forkserver
+    forkserver.client(__file__)
+
 import panflute as pf
 import re
+import sys
+import time
 
 document_pattern = r"[PD]([0-9]+)R[0-9]+"
 nonnormative_classes = {'example', 'note'}
 editorial_classes = {'ednote', 'draftnote'}
 note_classes = nonnormative_classes | editorial_classes
 
-srefs = {}
+# `wg21.csl` types with a dedicated rendering, which `native_reference` doesn't handle.
+native_reference_types = {
+    'bill', 'book', 'graphic', 'legal_case', 'legislation', 'motion_picture',
+    'report', 'song', 'paper-conference', 'chapter', 'speech', 'article-journal',
+    'thesis'}
+# Labels for which `citeproc`'s collation agrees with a plain string sort.
+native_label_pattern = r"[A-Z0-9]+"
+# The delimiters of the embedded Markdown in code elements, `md` and `em`,
+# unless overridden. `fragments.lua` gets them from `convert_fragments`.
+embedded_md_delimiters = ('@', '$')
+
 highlight_languages = set()
 
 headers = {}
 refs = {}
+suggestions = {}
 pnum_count = 0
 nonnormative_count = { c : 0 for c in nonnormative_classes }
 
+class JSONCodec:
+    """
+    Encodes and decodes the Pandoc AST with the standard `json` module,
+    exactly the way `pf.load` and `pf.dump` do.
+    """
+    name = 'json'
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data, object_hook=pf.elements.from_json)
+
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(
+            obj,
+            default=lambda elem: elem.to_json(),
+            check_circular=False,
+            separators=(',', ':'),
+            ensure_ascii=False).encode('utf-8')
+
+class ORJSONCodec(JSONCodec):
+    """
+    Encodes the Pandoc AST with `orjson`, which is about twice as fast as
+    `json` at it. Decoding stays with `json`: `orjson` doesn't support
+    `object_hook`, and since most of the decoding time is spent constructing
+    the panflute elements, the extra pass to construct them costs more than
+    `orjson` saves in parsing. See `tests/bench/codec.py`.
+    """
+    name = 'orjson'
+
+    @staticmethod
+    def dumps(obj):
+        import orjson
+        return orjson.dumps(obj.to_json() if isinstance(obj, pf.Element) else obj)
+
+def find_codec():
+    import importlib.util
+    return ORJSONCodec if importlib.util.find_spec('orjson') else JSONCodec
+
+codec = find_codec()
+
+class StableNames:
+    """
+    The number and the title of each stable name, looked up in `srefs.db` as
+    they're referenced, rather than parsing all of `srefs.json` for every paper.
+
+    `srefs.db` has the stable names of the current working draft and of the
+    pinned editions of it, see `srefs-db.py`. Only the ones in `edition` are
+    looked up, by its bit in the bitmask of the editions of each.
+    """
+    def __init__(self):
+        self.db = None
+        self.edition = 'draft'
+        self.mask = 1
+        self.found = {}
+
+    def open(self, path, edition='draft'):
+        """Returns whether `edition` is in the store."""
+        import sqlite3
+        self.db = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        bit = self.db.execute('SELECT bit FROM editions WHERE edition = ?', (edition,)).fetchone()
+        if bit is None:
+            return False
+        self.edition, self.mask = edition, 1 << bit[0]
+        return True
+
+    def url(self, target):
+        if self.edition == 'draft':
+            return f'https://eel.is/c++draft/{target}'
+        return f'https://timsong-cpp.github.io/cppwp/{self.edition}/{target}'
+
+    def get(self, name):
+        if name not in self.found:
+            self.found[name] = self.db.execute(
+                'SELECT number, title FROM srefs WHERE name = ? AND editions & ?',
+                (name, self.mask)).fetchone()
+        return self.found[name]
+
+srefs = StableNames()
+
+def load():
+    """Like `pf.load`, but decodes with `codec`."""
+    doc = codec.loads(sys.stdin.buffer.read())
+    doc.format = sys.argv[1] if len(sys.argv) > 1 else 'html'
+    # Each page of the chunked output is written by the HTML writer.
+    if doc.format == 'chunkedhtml':
+        doc.format = 'html'
+    return doc
+
+def dump(doc):
+    """Like `pf.dump`, but encodes with `codec`."""
+    sys.stdout.buffer.write(codec.dumps(doc))
+    sys.stdout.buffer.flush()
+
+def convert_text(text, input_format, output_format, extra_args=(), doc=None):
+    """
+    Like `pf.convert_text`, but the `'panflute'` input and output go through
+    `codec`. For `'panflute'` input, `doc` provides the `pandoc-api-version`,
+    which saves `pf.convert_text` from running `pandoc` just to ask for it.
+    """
+    if input_format == 'panflute':
+        text = codec.dumps({
+            'pandoc-api-version': doc.api_version,
+            'meta': {},
+            'blocks': [elem.to_json() for elem in text],
+        }).decode('utf-8')
+
+    out = profiler.run_pandoc(text, [
+        '--from', 'json' if input_format == 'panflute' else input_format,
+        '--to', 'json' if output_format == 'panflute' else output_format,
+        *extra_args])
+
+    if output_format == 'panflute':
+        return codec.loads(out).content.list
+    return '\n'.join(out.splitlines())
+
+class Profiler:
+    """
+    Opt-in instrumentation of the filter, enabled by setting `WG21_PROFILE` to
+    the path of the JSON report to write. See `PROFILE` in `flat.mk`.
+
+    The report has:
+      - `phases`: calls and inclusive time of `load`, `prepare`, `finalize`,
+        `dump` and the expensive steps within them.
+      - `actions`: calls and time of each `run_filters` action, in total and
+        per element type.
+      - `pandoc`: every `pandoc` subprocess, with the phase it ran in, its
+        arguments, input and output sizes in bytes, and duration.
+      - `counters`: e.g. the embedded Markdown fragments before and after
+        deduplication, and the sizes of the batches they're converted in.
+      - `peak_rss`: the peak resident set size of the filter in bytes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.start = time.perf_counter()
+        self.stack = []
+        self.phases = {}
+        self.actions = {}
+        self.pandoc = []
+        self.counters = {}
+
+    def phase(self, name):
+        """Returns a context manager that times the enclosed code as `name`."""
+        import contextlib
+
+        @contextlib.contextmanager
+        def timed():
+            # Recursive phases only count the outermost one toward the time.
+            nested = name in self.stack
+            self.stack.append(name)
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                elapsed = time.perf_counter() - start
+                self.stack.pop()
+                stats = self.phases.setdefault(name, {'calls': 0, 'time': 0.0})
+                stats['calls'] += 1
+                if not nested:
+                    stats['time'] += elapsed
+
+        return timed() if self.path else contextlib.nullcontext()
+
+    def timed(self, f):
+        """Wraps `f` to be timed as a phase of its name."""
+        if not self.path:
+            return f
+
+        import functools
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            with self.phase(f.__qualname__):
+                return f(*args, **kwargs)
+        return wrapper
+
+    def action(self, f):
+        """Wraps the `run_filters` action `f` to be timed per element type."""
+        if not self.path:
+            return f
+
+        types = self.actions.setdefault(f.__name__, {})
+        def wrapper(elem, doc):
+            start = time.perf_counter()
+            try:
+                return f(elem, doc)
+            finally:
+                stats = types.setdefault(type(elem).__name__, {'calls': 0, 'time': 0.0})
+                stats['calls'] += 1
+                stats['time'] += time.perf_counter() - start
+        return wrapper
+
+    def run_pandoc(self, text, args):
+        """`pf.run_pandoc`, recorded in the report."""
+        if not self.path:
+            return pf.run_pandoc(text, args)
+
+        start = time.perf_counter()
+        out = pf.run_pandoc(text, args)
+        self.pandoc.append({
+            'phase': self.stack[-1] if self.stack else None,
+            'args': args,
+            'input': len(text.encode('utf-8')) if text else 0,
+            'output': len(out.encode('utf-8')),
+            'time': time.perf_counter() - start,
+        })
+        return out
+
+    def count(self, name, n=1):
+        if self.path:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self):
+        if not self.path:
+            return
+
+        import resource
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # `ru_maxrss` is in bytes on macOS, and in kilobytes elsewhere.
+        if sys.platform != 'darwin':
+            peak_rss *= 1024
+
+        actions = {
+            name: {
+                'calls': sum(stats['calls'] for stats in types.values()),
+                'time': sum(stats['time'] for stats in types.values()),
+                'types': dict(sorted(types.items(), key=lambda kv: -kv[1]['time'])),
+            } for name, types in self.actions.items()
+        }
+
+        with open(self.path, 'w') as f:
+            json.dump({
+                'total': time.perf_counter() - self.start,
+                'phases': self.phases,
+                'actions': dict(sorted(actions.items(), key=lambda kv: -kv[1]['time'])),
+                'pandoc': self.pandoc,
+                'counters': self.counters,
+                'peak_rss': peak_rss,
+            }, f, indent=2)
+            f.write('\n')
+
+profiler = Profiler(os.environ.get('WG21_PROFILE'))
+
+class Index:
+    """
+    Opt-in index of the paper for other tools, e.g. link checkers, dashboards
+    and cross-paper indexes, enabled by setting `WG21_INDEX` to the path of the
+    JSON file to write. See `INDEX` in `flat.mk`.
+
+    The actions add to it what they already work out as they go, so that it
+    costs next to nothing. The index has:
+      - `document`, `title`, `date` and `format`: of the paper and the output.
+      - `headers`: the id, the level and the text of each heading.
+      - `pnums`: the number and the anchor of each paragraph number, e.g. as
+        numbered within `::: wording`.
+      - `notes`: the kind (`note` or `example`), the number and the anchor of
+        each note and example.
+      - `srefs`: the stable name, the paragraph, the URL of each stable name
+        reference, and whether the stable name was found.
+      - `citations`: the id and the URL of each entry of the References.
+      - `sections`: the text that `data/search.py` indexes, per heading: the
+        heading, the text of `::: wording`, the stable names and the code.
+    The anchors are `null` for the formats other than HTML.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {
+            'headers': [], 'pnums': [], 'notes': [], 'srefs': [], 'citations': [],
+            'sections': []}
+
+    def add(self, field, **entry):
+        if self.path:
+            self.entries[field].append(entry)
+
+    def add_sections(self, doc):
+        """
+        Adds the `sections` from the source, before the stable names are
+        resolved and the code is highlighted. The ones before the first
+        heading are under the id `null`.
+        """
+        section = None
+        def new_section(id, heading):
+            nonlocal section
+            section = {'id': id, 'heading': heading, 'wording': [], 'srefs': [], 'code': []}
+            self.entries['sections'].append(section)
+
+        def collect(elem, doc):
+            if isinstance(elem, (pf.Link, pf.Span)) and 'sref' in elem.classes:
+                section['srefs'].append(pf.stringify(elem).partition('#')[0])
+            elif isinstance(elem, (pf.Code, pf.CodeBlock)):
+                section['code'].append(elem.text)
+            elif isinstance(elem, pf.Div) and 'wording' in elem.classes:
+                section['wording'].append(pf.stringify(elem))
+
+        new_section(None, '')
+        for block in doc.content:
+            if isinstance(block, pf.Header):
+                new_section(block.identifier, pf.stringify(block))
+            block.walk(collect)
+
+    def report(self, doc):
+        if not self.path:
+            return
+
+        with open(self.path, 'w') as f:
+            json.dump({
+                'document': doc.get_metadata('document'),
+                'title': doc.get_metadata('title'),
+                'date': doc.get_metadata('date'),
+                'format': doc.format,
+                **self.entries,
+            }, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+index = Index(os.environ.get('WG21_INDEX'))
+
+# Whether the paper is only being validated, see `make <paper>.check`.
+checking = False
+
+def warn(message, needle=None, note=None):
+    """
+    Reports a problem with the paper. When `checking`, it's written as a JSON
+    diagnostic for `data/check.py`, which locates it in the source by `needle`,
+    the text it was written as, e.g. the stable name that's not found, or the
+    first of a list of them that's found.
+    """
+    if checking:
+        sys.stderr.write(json.dumps({'message': message, 'needle': needle}) + '\n')
+    else:
+        pf.debug(f'[WARNING] mpark/wg21: {message}' + (f'\n          {note}' if note else ''))
+
+def trigrams(name):
+    """The trigrams of `name`, case-folded. Same as `trigrams` in `suggest-db.py`."""
+    padded = f'\0{name.casefold()}\0'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def suggest(doc, kind, name, n=3):
+    """
+    The closest matches of `name` among the stable names (`kind` is `sref`) or
+    the citation ids (`kind` is `cite`), best first, like
+    `difflib.get_close_matches`. The candidates are the names in `suggest.db`
+    that share the most trigrams with `name`, so only a handful of them are
+    compared with it, rather than all of them. The stable names are only the
+    ones in the edition of `srefs`, by its bit like `StableNames.get`.
+    """
+    if (kind, name, n) in suggestions:
+        return suggestions[kind, name, n]
+
+    path = os.path.join(doc.get_metadata('data-dir'), 'suggest.db')
+    if not os.path.exists(path):
+        return []
+
+    import difflib
+    import sqlite3
+    grams = trigrams(name)
+    db = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        candidates = [candidate for candidate, in db.execute(
+            f"SELECT name FROM grams JOIN names USING (id) "
+            f"WHERE gram IN ({','.join('?' * len(grams))}) AND grams.kind = ? AND editions & ? "
+            f"GROUP BY id ORDER BY count(*) * 1.0 / (? + size - count(*)) DESC LIMIT ?",
+            (*grams, kind, srefs.mask, len(grams), 4 * n))]
+    finally:
+        db.close()
+
+    folded = name.casefold()
+    scored = sorted(
+        (-difflib.SequenceMatcher(None, folded, candidate.casefold()).ratio(), candidate)
+        for candidate in candidates)
+    suggestions[kind, name, n] = [candidate for score, candidate in scored[:n] if -score >= 0.6]
+    return suggestions[kind, name, n]
+
+def did_you_mean(names):
+    """The suggestion for a name that's not found, e.g. from `suggest`."""
+    if not names:
+        return ''
+    *rest, last = names
+    return f" Did you mean {', '.join(rest)} or {last}?" if rest else f' Did you mean {last}?'
+
 def prepend_elem(elem, *prefix):
     assert(all(isinstance(e, pf.Inline) for e in prefix))
 
@@ -53,35 +453,58 @@ def wrap_elem(opening, elem, closing):
         elem.content.insert(0, opening)
         elem.content.append(closing)
 
-def convert_fragments(fragments, input_format):
+def convert_fragments(fragments, input_format, embedded=None):
     """
     Converts a list of fragment texts into panflute elements
-    in a single invocation of `pf.convert_text`.
+    in a single invocation of `convert_text`.
 
     A fragment is essentially a piece of raw Markdown text that we need to parse
     ourselves. Examples are embedded Markdown in code elements within @, and
     the "new text" portion of [old text](new text){.sub} syntax.
+
+    The fragments within the fragments are parsed in the same invocation by
+    `fragments.lua`, at any depth: the substitutions, and with `embedded`, the
+    embedded Markdown of the code elements, which is added to `embedded` by
+    fragment text.
     """
     # This separates the fragments structurally in a list, and
     # injects an empty span []{} in front of the fragment such that a fragment
     # that starts with a - (dash) doesn't get interpreted as a nested list.
-    result = pf.convert_text(
+    result = convert_text(
                '\n'.join(f'- []{{}}{fragment}' for fragment in fragments),
                input_format=input_format,
-               output_format='panflute')
-    assert(len(result) == 1)
-    lst = result[0]
-    assert(isinstance(lst, pf.BulletList))
-    assert(len(lst.content) == len(fragments))
-    process_subs(lst, input_format)
-    for item in lst.content:
-        assert(len(item.content) == 1)
-        plain = item.content[0]
-        assert(isinstance(plain, pf.Plain))
-        marker = plain.content.pop(0)
-        assert(isinstance(marker, pf.Span) and not marker.content)
+               output_format='panflute',
+               extra_args=[
+                   '-L', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fragments.lua'),
+                   '-M', f'fragments-from={input_format}',
+                   *(['-M', 'fragments-embedded',
+                      '-M', f'fragments-md={embedded_md_delimiters[0]}',
+                      '-M', f'fragments-em={embedded_md_delimiters[1]}']
+                     if embedded is not None else [])])
+    assert(len(result) in (1, 2) if embedded is not None else len(result) == 1)
+    for lst in result:
+        assert(isinstance(lst, pf.BulletList))
+        # Only the ones that `fragments.lua` leaves, if any.
+        process_subs(lst, input_format)
+
+    def items(lst):
+        for item in lst.content:
+            assert(len(item.content) == 1)
+            plain = item.content[0]
+            assert(isinstance(plain, pf.Plain))
+            marker = plain.content.pop(0)
+            assert(isinstance(marker, pf.Span) and not marker.content)
+            yield marker, plain
+
+    if len(result) == 2:
+        for marker, plain in items(result[1]):
+            embedded[marker.attributes['fragment']] = plain
+
+    assert(len(result[0].content) == len(fragments))
+    for _, plain in items(result[0]):
         yield plain
 
+@profiler.timed
 def process_subs(elem, input_format):
     """
     Processes [old text](new text){.sub} elements under a given element
@@ -107,11 +530,16 @@ def process_subs(elem, input_format):
 
     elem.walk(subs)
     assert(len(adds) == len(fragments))
+    profiler.count('sub fragments', len(fragments))
     if adds:
         for add, item in zip(adds, convert_fragments(fragments, input_format)):
             add.content = item.content
 
+@profiler.timed
 def prepare(doc):
+    global checking
+    checking = bool(doc.get_metadata('check'))
+
     if doc.get_metadata('date') == 'today':
         import datetime
         doc.metadata['date'] = datetime.date.today().isoformat()
@@ -121,31 +549,40 @@ def prepare(doc):
     if number is not None:
         doc.metadata['number'] = number.group(1)
     else:
-        pf.debug(f"""[WARNING] mpark/wg21: Document number '{document}' is an unrecognized format; expected "{document_pattern}".
-          This just means that [Latest] and [Status] links will be missing.""")
-
-    title = pf.convert_text(
-        pf.Plain(*doc.metadata['title'].content),
-        input_format='panflute',
-        output_format='markdown')
-    doc.metadata['pagetitle'] = title   # HTML
-    doc.metadata['title-meta'] = title  # PDF
+        warn(f'Document number \'{document}\' is an unrecognized format; expected "{document_pattern}".',
+             needle=document,
+             note='This just means that [Latest] and [Status] links will be missing.')
 
     datadir = doc.get_metadata('data-dir')
 
-    with open(os.path.join(datadir, 'defaults', 'doc.yaml'), 'r') as f:
+    with open(os.path.join(datadir, 'defaults', 'base.yaml'), 'r') as f:
         import yaml
         doc.metadata['from'] = yaml.safe_load(f)['from']
 
-    with open(os.path.join(datadir, 'srefs.json'), 'r') as f:
-        srefs.update(json.load(f))
+    edition = doc.get_metadata('working-draft', '').strip().lower()
+    if not srefs.open(os.path.join(datadir, 'srefs.db'), edition or 'draft'):
+        warn(f'working draft {edition} is not pinned; using the current working draft.',
+             needle=edition,
+             note=f'Tip: add {edition} to SREFS_EDITIONS to pin it, see `data/srefs-db.py`')
+
+    with open(os.path.join(datadir, 'highlight-languages.txt'), 'r') as f:
+        highlight_languages.update(f.read().splitlines())
+
+    if checking:
+        check_citations(doc)
+        return
+
+    if index.path:
+        index.add_sections(doc)
+
+    if doc.get_metadata('preview'):
+        preview(doc)
+    elif doc.get_metadata('citations') == 'native':
+        native_citations(doc)
 
-    highlight_languages.update(
-        pf.run_pandoc(
-            args=['--data-dir', datadir,
-                  '-d', 'formatting',
-                  '--list-highlight-languages'])
-        .splitlines())
+    if (resource_cache := doc.get_metadata('resource-cache')):
+        size = float(doc.get_metadata('resource-cache-size', 100))
+        ResourceCache(resource_cache, size * 1024 * 1024).run(doc)
 
     process_subs(doc, doc.get_metadata('from'))
 
@@ -191,11 +628,13 @@ def sref(elem, doc):
 
     link = pf.Link(
         pf.Str(f'[{name}]' + (f'/{pnum}' if pnum else '')),
-        url=f'https://eel.is/c++draft/{target}')
+        url=srefs.url(target))
     info = srefs.get(name)
+    index.add('srefs', name=name, pnum=pnum or None, url=link.url, found=info is not None)
     if info is None:
-        pf.debug(f"""[WARNING] mpark/wg21: stable name {name} not found.
-          Tip: run `make update` to refresh the local databases, including stable names""")
+        warn(f'stable name {name} not found.' + did_you_mean(suggest(doc, 'sref', name)),
+             needle=name,
+             note='Tip: run `make update` to refresh the local databases, including stable names')
         return link
 
     number, title = info
@@ -386,6 +825,8 @@ def divspan(elem, doc):
                 label.append(pf.Link(pf.Str(num), url=f'#{elem.identifier}'))
             else:
                 label.append(pf.Str(num))
+        index.add('notes', kind=name, number=num,
+                  id=(elem.identifier or None) if doc.format == 'html' else None)
 
         wrap_elem(
             pf.Span(pf.Str('[ '), pf.Emph(*label, pf.Str(':')), pf.Space()),
@@ -407,8 +848,17 @@ def divspan(elem, doc):
     def pnum():
         num = pf.stringify(elem)
         if '#' in num.split('.'):
-            pf.debug(
-                f'[WARNING] mpark/wg21: automatic paragraph number {num} ignored outside of ::: wording')
+            # `[#]` is likely to be in a `wording` div before, as well.
+            after = ''.join(map(pf.stringify, elem.parent.content[elem.index + 1:]))
+            warn(f'automatic paragraph number {num} ignored outside of ::: wording',
+                 needle=[' '.join(after.split()[:3]), f'[{num}]'])
+
+        anchor_id = None
+        if doc.format == 'html':
+            global pnum_count
+            pnum_count += 1
+            anchor_id = f'pnum-{pnum_count}'
+        index.add('pnums', number=num, id=anchor_id)
 
         if '.' in num:
             num = f'({num})'
@@ -416,9 +866,6 @@ def divspan(elem, doc):
         if doc.format == 'latex':
             return pf.RawInline(f'\\pnum{{{num}}}', 'latex')
         elif doc.format == 'html':
-            global pnum_count
-            pnum_count += 1
-            anchor_id = f'pnum-{pnum_count}'
             return pf.Span(
                 pf.Link(pf.Str(num), url=f'#{anchor_id}',
                         identifier=anchor_id, classes=['marginalized']),
@@ -567,23 +1014,23 @@ def cmptable(table, doc):
     first_row = True
     table.content.append(pf.HorizontalRule())
 
-    def warn(elem):
-        pf.debug('[WARNING] mpark/wg21:', type(elem), pf.stringify(elem, newlines=False),
-                 'in a comparison table is ignored')
+    def ignored(elem):
+        text = pf.stringify(elem, newlines=False)
+        warn(f'{type(elem)} {text} in a comparison table is ignored', needle=text)
 
     for elem in table.content:
         if isinstance(elem, pf.Header):
             if not isinstance(header, pf.Null):
-                warn(header)
+                ignored(header)
 
             if first_row:
                 header = pf.Plain(*elem.content)
                 width = float(elem.attributes['width']) if 'width' in elem.attributes else None
             else:
-                warn(elem)
+                ignored(elem)
         elif isinstance(elem, pf.BlockQuote):
             if caption is not None:
-                warn(caption)
+                ignored(caption)
 
             caption = pf.Caption(elem)
         elif isinstance(elem, pf.CodeBlock):
@@ -601,7 +1048,7 @@ def cmptable(table, doc):
             rows.append(pf.TableRow(*[pf.TableCell(example) for example in examples]))
             examples = []
         else:
-            warn(elem)
+            ignored(elem)
 
     if not all(isinstance(header, pf.Null) for header in headers):
         kwargs['head'] = pf.TableHead(pf.TableRow(*[pf.TableCell(header) for header in headers]))
@@ -611,10 +1058,11 @@ def cmptable(table, doc):
         widths = [width / total_width for width in widths]
     else:
         if not all(width is None for width in widths):
-            pf.debug(f"""[WARNING] mpark/wg21: cmptable widths must be specified for all columns or none.
-          {table}
+            warn('cmptable widths must be specified for all columns or none.',
+                 needle='cmptable',
+                 note=f'''{table}
 
-          Ignoring the specified widths and defaulting to even column widths.""")
+          Ignoring the specified widths and defaulting to even column widths.''')
         widths = [1 / len(widths) for _ in widths]
 
     kwargs['caption'] = pf.Caption() if caption is None else caption
@@ -633,6 +1081,7 @@ def header(elem, doc):
 
     url = f'#{elem.identifier}'
     headers[url] = pf.stringify(elem)
+    index.add('headers', id=elem.identifier, level=elem.level, text=headers[url])
 
     elem.content.append(pf.Link(url=url, classes=['self-link']))
 
@@ -674,6 +1123,476 @@ def collect_refs(elem, doc):
     elem.walk(find_urls)
     if len(urls) == 1:
         refs[f'#{elem.identifier}'] = urls[0]
+    index.add('citations', id=elem.identifier[len('ref-'):], url=urls[0] if len(urls) == 1 else None)
+
+def native_reference(item):
+    """
+    Renders a bibliography entry the way `citeproc` does with `wg21.csl`.
+
+    Only the fixed shape of the entries in https://wg21.link/index.yaml is
+    supported: a plain label, `family`-only authors, an optional date, a title
+    and a URL. Returns `None` for anything else, which is left to `citeproc`.
+    """
+    def words(text):
+        if (
+            not isinstance(text, str) or
+            not text or
+            ' '.join(text.split()) != text or
+            any(c in text for c in '"\'<>&\\‘’“”') or
+            text[0] in '.,:;!?' or
+            text[-1] in '.,:;!?)]'
+        ):
+            return None
+        return text.split(' ')
+
+    def sentence(lst):
+        return [w + '.' if i == len(lst) - 1 else w for i, w in enumerate(lst)]
+
+    if not (
+        set(item) <= {'id', 'citation-label', 'type', 'author', 'issued', 'title', 'URL'} and
+        item.get('type', 'article') not in native_reference_types and
+        isinstance(item.get('citation-label'), str) and
+        re.fullmatch(native_label_pattern, item['citation-label']) and
+        isinstance(item.get('URL'), str) and
+        words(item['URL']) == [item['URL']]
+    ):
+        return None
+
+    groups = []
+
+    authors = item.get('author', [])
+    if not (isinstance(authors, list) and
+            all(isinstance(a, dict) and a.keys() == {'family'} for a in authors)):
+        return None
+    names = [words(a['family']) for a in authors]
+    if None in names:
+        return None
+    if names:
+        *init, last = [' '.join(name) for name in names]
+        if not init:
+            text = last
+        elif len(init) == 1:
+            text = f'{init[0]} and {last}'
+        else:
+            text = f'{", ".join(init)}, and {last}'
+        groups.append(sentence(text.split(' ')))
+
+    if 'issued' in item:
+        date_parts = item['issued'].get('date-parts') if isinstance(item['issued'], dict) else None
+        if not (
+            isinstance(date_parts, list) and len(date_parts) == 1 and
+            isinstance(date_parts[0], list) and 1 <= len(date_parts[0]) <= 3 and
+            all(isinstance(part, int) for part in date_parts[0])
+        ):
+            return None
+        year, *rest = date_parts[0]
+        groups.append(sentence(['-'.join([f'{year:04}', *(f'{p:02}' for p in rest)])]))
+
+    title = words(item.get('title'))
+    if title is None:
+        return None
+    groups.append(sentence(title))
+
+    label = item['citation-label']
+    content = [pf.Str(f'[{label}]')]
+    for group in groups:
+        for word in group:
+            content.extend([pf.Space(), pf.Str(word)])
+    content.extend([
+        pf.Space(),
+        pf.Link(pf.Span(pf.Str(item['URL']), classes=['csl-indent']), url=item['URL'])])
+
+    return {
+        'label': label,
+        'title': title,
+        'entry': pf.Div(pf.Para(*content), identifier=f'ref-{item["id"]}', classes=['csl-entry']),
+    }
+
+@profiler.timed
+def native_citations(doc):
+    """
+    Renders citations and the References section directly from the indexed
+    reference store (`csl.db`), rather than having `citeproc` load all of
+    `csl.json`. This is enabled by building with `CITATIONS := native`.
+
+    The output is the same as `citeproc` with `wg21.csl`. If anything is
+    outside of what `native_reference` supports, `citeproc` is invoked on
+    the citations alone, with only the cited references as the bibliography.
+    """
+    cites = []
+    titled = set()
+    refs_divs = []
+    def collect(elem, doc):
+        if isinstance(elem, pf.Cite):
+            cites.append(elem)
+        elif isinstance(elem, pf.Div) and elem.identifier == 'refs':
+            refs_divs.append(elem)
+        # Same condition as `citetitle.lua`, which only runs with `citeproc`.
+        elif (isinstance(elem, pf.Span) and
+              elem.classes == ['title'] and
+              len(elem.content) == 1 and
+              isinstance(elem.content[0], pf.Cite)):
+            titled.add(id(elem.content[0]))
+
+    doc.walk(collect)
+
+    # `nocite` can refer to any (or all) of the references.
+    if doc.get_metadata('nocite') is not None:
+        citeproc(doc, cites, titled, refs_divs)
+        return
+
+    if not cites:
+        return
+
+    ids = sorted({citation.id for cite in cites for citation in cite.citations})
+
+    import sqlite3
+    db = sqlite3.connect(
+        f"file:{os.path.join(doc.get_metadata('data-dir'), 'csl.db')}?mode=ro", uri=True)
+    try:
+        items = {
+            id: json.loads(item)
+            for id, item in db.execute(
+                f"SELECT id, item FROM refs WHERE id IN ({','.join('?' * len(ids))})", ids)
+        }
+    finally:
+        db.close()
+
+    manual = {ref.get('id') for ref in doc.get_metadata('references', [])}
+    references = {id: native_reference(items[id]) for id in ids if id in items}
+
+    if not (
+        not refs_divs and
+        len(references) == len(ids) and
+        None not in references.values() and
+        not manual.intersection(ids) and
+        doc.get_metadata('csl') == 'wg21' and
+        isinstance(doc.metadata.content.get('reference-section-title', pf.MetaInlines()), pf.MetaInlines) and
+        doc.get_metadata('lang', 'en').startswith('en') and
+        doc.get_metadata('link-citations', False) and
+        doc.get_metadata('link-bibliography', True) and
+        not doc.get_metadata('suppress-bibliography', False) and
+        all(
+            not citation.prefix and not citation.suffix
+            for cite in cites for citation in cite.citations) and
+        all(
+            len({citation.id for citation in cite.citations}) == len(cite.citations)
+            for cite in cites)
+    ):
+        citeproc(doc, cites, titled, refs_divs, list(items.values()))
+        return
+
+    for cite in cites:
+        content = []
+        for citation in sorted(cite.citations, key=lambda c: references[c.id]['label']):
+            if content:
+                content.append(pf.Str(','))
+            reference = references[citation.id]
+            link = pf.Link(pf.Str(f"[{reference['label']}]"), url=f'#ref-{citation.id}')
+            if id(cite) in titled:
+                title = list(reference['title'])
+                title[0] = f'({title[0]}'
+                title[-1] = f'{title[-1]})'
+                for word in title:
+                    link.content.extend([pf.Space(), pf.Str(word)])
+            content.append(link)
+        cite.content = content
+
+    title = doc.metadata.content.get('reference-section-title')
+    if isinstance(title, pf.MetaInlines):
+        doc.content.append(pf.Header(
+            *codec.loads(codec.dumps(title.content.to_json())),
+            level=1, identifier='bibliography', classes=['unnumbered']))
+
+    doc.content.append(pf.Div(
+        *(reference['entry']
+          for reference in sorted(references.values(), key=lambda r: r['label'])),
+        identifier='refs',
+        classes=['references', 'csl-bib-body'],
+        attributes={'entry-spacing': '0'}))
+
+@profiler.timed
+def citeproc(doc, cites, titled, refs_divs, items=None):
+    """
+    Runs `citeproc` on a document consisting only of the citations and the
+    `#refs` div (if any), with `items` (if given) as the bibliography in place
+    of `csl.json`. The results are then put back into the original document.
+    """
+    import tempfile
+
+    for cite in cites:
+        if id(cite) in titled:
+            for citation in cite.citations:
+                citation.suffix.extend([pf.Str(','), pf.Space(), pf.Str('1')])
+
+    meta = doc.metadata.content.to_json()
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        if items is not None:
+            json.dump(items, f)
+            paths = doc.get_metadata('bibliography', [])
+            meta['bibliography'] = pf.MetaList(*(
+                pf.MetaString(f.name if path == 'csl.json' else path)
+                for path in ([paths] if isinstance(paths, str) else paths))).to_json()
+
+    datadir = doc.get_metadata('data-dir')
+    try:
+        result = codec.loads(
+            profiler.run_pandoc(
+                codec.dumps({
+                    'pandoc-api-version': doc.api_version,
+                    'meta': meta,
+                    'blocks': [{'t': 'Para', 'c': [cite.to_json()]} for cite in cites] +
+                              [div.to_json() for div in refs_divs[:1]],
+                }).decode('utf-8'),
+                args=['--from', 'json', '--to', 'json', '--citeproc',
+                      '--data-dir', datadir,
+                      '--resource-path', os.pathsep.join(['.', datadir])]))
+    finally:
+        os.remove(f.name)
+
+    for cite, para in zip(cites, result.content):
+        cite.content = para.content[0].content
+
+    bibliography = result.content[len(cites):]
+    if refs_divs:
+        refs_divs[0].parent.content[refs_divs[0].index] = bibliography[0]
+    else:
+        doc.content.extend(bibliography)
+
+def preview(doc):
+    """
+    Prepares a draft preview, built by `make <paper>.preview.html`. The
+    stylesheets and the icon are linked from the data directory, and each
+    citation is rendered as a bare link to `wg21.link`, or to the `URL` of a
+    reference in the `references` metadata, without looking up the
+    bibliography.
+    """
+    doc.metadata['css-dir'] = os.path.abspath(doc.get_metadata('data-dir'))
+
+    urls = {ref.get('id'): ref.get('URL') for ref in doc.get_metadata('references', [])}
+    def cite(elem, doc):
+        if not isinstance(elem, pf.Cite):
+            return None
+
+        content = []
+        for citation in elem.citations:
+            if content:
+                content.append(pf.Str(','))
+            url = urls.get(citation.id) or f'https://wg21.link/{citation.id}'
+            content.append(pf.Link(pf.Str(f'[{citation.id}]'), url=url))
+        elem.content = content
+
+    doc.walk(cite)
+
+class ResourceCache:
+    """
+    A local, content-addressed cache of the remote images that a paper
+    references, set by `RESOURCE_CACHE` in `flat.mk`. Their URLs are rewritten
+    to the cached files, so Pandoc embeds those instead of fetching the URLs
+    on every build, and builds work offline once the cache is filled.
+
+    The cache directory has:
+      - `objects/`: the resources, named by the SHA-256 of their content.
+      - `index.json`: for each URL, its object, the `ETag` and `Last-Modified`
+        validators, when it expires, and when it was last used.
+
+    A URL is only fetched again once it expires, per its `Cache-Control:
+    max-age` or after `default_max_age`, and then with the validators, so that
+    an unchanged resource isn't downloaded again. If it can't be fetched, the
+    stale object is used. Objects that weren't used recently are removed once
+    the cache is over `resource-cache-size` MiB.
+    """
+
+    default_max_age = 7 * 24 * 60 * 60
+    timeout = 10
+    raw_src_re = re.compile(r'''(\bsrc=["'])(https?://[^"']+)''')
+
+    def __init__(self, directory, max_size):
+        self.directory = directory
+        self.max_size = max_size
+        self.index = {}
+
+    def run(self, doc):
+        """Rewrites the URLs of the remote images in `doc` to the cached files."""
+        images = []
+        raws = []
+        def collect(elem, doc):
+            if isinstance(elem, pf.Image) and elem.url.startswith(('http://', 'https://')):
+                images.append(elem)
+            elif isinstance(elem, (pf.RawBlock, pf.RawInline)) and elem.format == 'html':
+                if self.raw_src_re.search(elem.text):
+                    raws.append(elem)
+        doc.walk(collect)
+        if not (images or raws):
+            return
+
+        urls = {elem.url for elem in images}
+        for elem in raws:
+            urls.update(url for _, url in self.raw_src_re.findall(elem.text))
+
+        import fcntl
+        os.makedirs(os.path.join(self.directory, 'objects'), exist_ok=True)
+        # Serializes the builds that share the cache, e.g. with `make -j`.
+        with open(os.path.join(self.directory, 'index.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._load()
+            paths = self._resolve(sorted(urls))
+            self._evict(set(paths.values()))
+            self._save()
+
+        for elem in images:
+            elem.url = paths.get(elem.url, elem.url)
+        for elem in raws:
+            elem.text = self.raw_src_re.sub(
+                lambda m: m.group(1) + paths.get(m.group(2), m.group(2)), elem.text)
+
+    def _load(self):
+        path = os.path.join(self.directory, 'index.json')
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self.index = json.load(f)
+
+    def _save(self):
+        path = os.path.join(self.directory, 'index.json')
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+            f.write('\n')
+        os.replace(f'{path}.tmp', path)
+
+    def _object(self, name):
+        return os.path.abspath(os.path.join(self.directory, 'objects', name))
+
+    def _resolve(self, urls):
+        """Returns the paths of the cached files for `urls`, fetching as needed."""
+        import concurrent.futures
+
+        now = time.time()
+        stale = [
+            url for url in urls
+            if url not in self.index
+            or self.index[url]['expires'] <= now
+            or not os.path.exists(self._object(self.index[url]['object']))]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+            for url, error in zip(stale, pool.map(self._fetch, stale)):
+                if error is None:
+                    continue
+                if url in self.index and os.path.exists(self._object(self.index[url]['object'])):
+                    pf.debug(f'[WARNING] mpark/wg21: using the cached {url}, as it could not be fetched: {error}')
+                else:
+                    self.index.pop(url, None)
+                    pf.debug(f'[WARNING] mpark/wg21: could not fetch {url} into the resource cache: {error}')
+
+        paths = {}
+        for url in urls:
+            if (entry := self.index.get(url)) is not None:
+                entry['used'] = now
+                paths[url] = self._object(entry['object'])
+        return paths
+
+    def _fetch(self, url):
+        """Fetches `url` into the cache, and returns the error, if any."""
+        import hashlib
+        import mimetypes
+        import urllib.error
+        import urllib.parse
+        import urllib.request
+
+        entry = self.index.get(url, {})
+        request = urllib.request.Request(url, headers={'User-Agent': 'mpark/wg21'})
+        if os.path.exists(self._object(entry.get('object', ''))):
+            if entry.get('etag'):
+                request.add_header('If-None-Match', entry['etag'])
+            if entry.get('last-modified'):
+                request.add_header('If-Modified-Since', entry['last-modified'])
+
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                content = response.read()
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                return e
+            headers = e.headers
+            content = None
+        except (urllib.error.URLError, OSError) as e:
+            return e
+
+        max_age = re.search(r'max-age=(\d+)', headers.get('Cache-Control', ''))
+        entry['expires'] = time.time() + (int(max_age.group(1)) if max_age else self.default_max_age)
+        if content is not None:
+            # Pandoc infers the type of an embedded file from its extension.
+            ext = os.path.splitext(urllib.parse.urlparse(url).path)[1]
+            if headers.get_content_type() != 'application/octet-stream':
+                ext = mimetypes.guess_extension(headers.get_content_type()) or ext
+            entry['object'] = hashlib.sha256(content).hexdigest() + ext
+            entry['size'] = len(content)
+            entry['etag'] = headers.get('ETag')
+            entry['last-modified'] = headers.get('Last-Modified')
+            path = self._object(entry['object'])
+            if not os.path.exists(path):
+                with open(f'{path}.{os.getpid()}.tmp', 'wb') as f:
+                    f.write(content)
+                os.replace(f'{path}.{os.getpid()}.tmp', path)
+        self.index[url] = entry
+        return None
+
+    def _evict(self, keep):
+        """Removes the least recently used objects, except for `keep`, over the limit."""
+        objects = {}
+        for url, entry in self.index.items():
+            used, size = objects.get(entry['object'], (0, 0))
+            objects[entry['object']] = max(used, entry['used']), entry['size']
+
+        total = sum(size for _, size in objects.values())
+        for name, (used, size) in sorted(objects.items(), key=lambda kv: kv[1][0]):
+            if total <= self.max_size:
+                break
+            if self._object(name) in keep:
+                continue
+            if os.path.exists(self._object(name)):
+                os.remove(self._object(name))
+            self.index = {url: entry for url, entry in self.index.items() if entry['object'] != name}
+            total -= size
+
+def check_citations(doc):
+    """
+    Validates the citations and the `#ref-` links against the indexed reference
+    store (`csl.db`) and the `references` metadata, for `make <paper>.check`,
+    which doesn't render them.
+    """
+    cited = []
+    def collect(elem, doc):
+        if isinstance(elem, pf.Cite):
+            cited.extend((citation.id, f'@{citation.id}') for citation in elem.citations)
+        elif isinstance(elem, pf.Link) and elem.url.startswith('#ref-'):
+            cited.append((elem.url[len('#ref-'):], elem.url))
+
+    doc.walk(collect)
+    if not cited:
+        return
+
+    ids = sorted({id for id, _ in cited})
+
+    import sqlite3
+    db = sqlite3.connect(
+        f"file:{os.path.join(doc.get_metadata('data-dir'), 'csl.db')}?mode=ro", uri=True)
+    try:
+        found = {
+            id for id, in db.execute(
+                f"SELECT id FROM refs WHERE id IN ({','.join('?' * len(ids))})", ids)}
+    finally:
+        db.close()
+
+    found.update(ref.get('id') for ref in doc.get_metadata('references', []))
+    for id, needle in cited:
+        if id not in found:
+            if needle.startswith('@'):
+                warn(f'citation {id} not found.' + did_you_mean(suggest(doc, 'cite', id)),
+                     needle=needle)
+            else:
+                warn(f'reference {id} not found for link to: {needle}.' +
+                     did_you_mean([f'#ref-{match}' for match in suggest(doc, 'cite', id)]),
+                     needle=needle)
 
 def citation_link(elem, doc):
     if not (isinstance(elem, pf.Link) and elem.url.startswith("#ref-")):
@@ -694,7 +1613,7 @@ def automatic_header_link(elem, doc):
         return None
 
     if (header_text := headers.get(elem.url)) is None:
-        pf.debug('[WARNING] mpark/wg21: cannot find automatic text for link to:', elem.url)
+        warn(f'cannot find automatic text for link to: {elem.url}', needle=elem.url)
         return None
 
     return pf.Link(pf.Str(header_text), url=elem.url)
@@ -762,7 +1681,7 @@ def embed_md_init(elem, doc):
         'raw' not in elem.classes and
         ('embed_md' in elem.classes or
          any(c in implicit_classes for c in elem.classes)))
-    md, em = ('@', '$') if enabled else ('none', 'none')
+    md, em = embedded_md_delimiters if enabled else ('none', 'none')
     md = elem.attributes.pop('md', md)
     if md != 'none':
         elem.attributes['md'] = md
@@ -812,20 +1731,22 @@ class CodeElems:
                  return placeholder
 
     @staticmethod
+    @profiler.timed
     def _convert_blocks(blocks, token, doc):
         def intersperse(lst, item):
             result = [item] * (len(lst) * 2 - 1)
             result[0::2] = lst
             return result
 
-        text = pf.convert_text(
+        text = convert_text(
             intersperse(blocks, pf.Plain(pf.RawInline(token, doc.format))),
             input_format='panflute',
             output_format=doc.format,
             extra_args=[
                 '--data-dir', doc.get_metadata('data-dir'),
                 '-d', 'formatting',
-                '--wrap', 'none'])
+                '--wrap', 'none'],
+            doc=doc)
 
         if doc.format == 'latex':
             # The normal text mode such as "template<class" gets translated
@@ -840,7 +1761,70 @@ class CodeElems:
         sep = f'\n\n{token}\n\n' if doc.format == 'latex' else f'\n{token}\n'
         return text, sep
 
+    # Tokens recognized by `_highlight`, named by their Skylighting class.
+    _cpp_tokens = re.compile(r"""
+        (?P<co>//[^\n]*|/\*[^\n]*?\*/) |
+        (?P<st>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)+') |
+        (?P<pp>^[ \t]*\#[ \t]*\w+) |
+        (?P<dv>\b[0-9][0-9A-Za-z_.']*) |
+        (?P<dt>\b(?:bool|char|char8_t|char16_t|char32_t|double|float|int|long|
+                    short|signed|unsigned|void|wchar_t)\b) |
+        (?P<kw>\b(?:alignas|alignof|auto|break|case|catch|class|co_await|co_return|
+                    co_yield|concept|const|consteval|constexpr|constinit|const_cast|
+                    continue|decltype|default|delete|do|dynamic_cast|else|enum|
+                    explicit|export|extern|false|final|for|friend|goto|if|import|
+                    inline|module|mutable|namespace|new|noexcept|nullptr|operator|
+                    override|private|protected|public|register|reinterpret_cast|
+                    requires|return|sizeof|static|static_assert|static_cast|struct|
+                    switch|template|this|thread_local|throw|true|try|typedef|typeid|
+                    typename|union|using|virtual|volatile|while)\b)
+    """, re.MULTILINE | re.VERBOSE)
+    _diff_tokens = re.compile(r'(?P<va>^\+[^\n]*)|(?P<st>^-[^\n]*)', re.MULTILINE)
+
+    @classmethod
+    @profiler.timed
+    def _highlight(cls, elems, token):
+        """
+        A cheap stand-in for `_convert_blocks` for draft previews in HTML.
+        Comments, literals, keywords and preprocessor directives are
+        highlighted by regexes for C and C++, and added and removed lines for
+        diffs. Code in other languages is left as is.
+        """
+        import html
+
+        def highlight(text, language):
+            tokens = {'c': cls._cpp_tokens, 'cpp': cls._cpp_tokens, 'diff': cls._diff_tokens}
+            if language not in tokens:
+                return html.escape(text)
+
+            pieces = []
+            start = 0
+            for match in tokens[language].finditer(text):
+                pieces.append(html.escape(text[start:match.start()]))
+                pieces.append(f'<span class="{match.lastgroup}">{html.escape(match.group())}</span>')
+                start = match.end()
+            pieces.append(html.escape(text[start:]))
+            return ''.join(pieces)
+
+        results = []
+        for elem in elems:
+            language = next((c for c in elem.classes if c in highlight_languages), None)
+            classes = ' '.join(['sourceCode', *elem.classes])
+            text = highlight(elem.text, language)
+            if isinstance(elem, pf.Code):
+                results.append(f'<code class="{classes}">{text}</code>')
+            else:
+                identifier = f' id="{elem.identifier}"' if elem.identifier else ''
+                lines = ''.join(f'<span>{line}</span>\n' for line in text.split('\n'))
+                results.append(
+                    f'<div class="sourceCode"{identifier}><pre class="{classes}">'
+                    f'<code class="{classes}">{lines.rstrip()}</code></pre></div>')
+
+        sep = f'\n{token}\n'
+        return sep.join(results), sep
+
     @classmethod
+    @profiler.timed
     def _convert_fragments(cls, fragments, doc):
         if not fragments:
             return []
@@ -849,7 +1833,7 @@ class CodeElems:
         # @$foo$@ be interpreted as inline math.
         #
         # `_replace_fragments_with_placeholders` can add to fragments,
-        # which is why we loop while converted is fewer than fragments.
+        # which is why we loop while processed is fewer than fragments.
         def nested_code(elem, doc):
             if not isinstance(elem, pf.Code):
                 return None
@@ -862,30 +1846,40 @@ class CodeElems:
 
             elem.text = cls._replace_fragments_with_placeholders(elem.text, md, em)
 
-        converted = []
-        while len(converted) < len(fragments):
-            batch = fragments[len(converted):]
-            blocks = []
-            # -raw_html to avoid <T> in foo<T> to be interpreted as an HTML tag.
-            # -smart to avoid things like ... to get transformed into \dots
-            for plain in convert_fragments(
-                    batch, f"{doc.get_metadata('from')}-raw_html-smart"):
+        # The fragments embedded in the fragments are parsed along with them,
+        # so there's only another batch for the ones `fragments.lua` misses.
+        parsed = {}
+        blocks = []
+        while len(blocks) < len(fragments):
+            batch = fragments[len(blocks):]
+            missing = [fragment for fragment in batch if fragment not in parsed]
+            if missing:
+                profiler.count('fragment batches')
+                profiler.count('fragments converted', len(missing))
+                # -raw_html to avoid <T> in foo<T> to be interpreted as an HTML tag.
+                # -smart to avoid things like ... to get transformed into \dots
+                plains = list(convert_fragments(
+                    missing, f"{doc.get_metadata('from')}-raw_html-smart", parsed))
+                parsed.update(zip(missing, plains))
+            for fragment in batch:
+                plain = parsed[fragment]
                 for f in formatting:
                     plain = plain.walk(f, doc)
                 plain.walk(nested_code, doc)
                 blocks.append(plain)
-            token = cls._compute_unique_placeholder(fragments)
-            text, sep = cls._convert_blocks(blocks, token, doc)
-            result = text.split(sep)
-            assert(len(result) == len(batch))
-            converted.extend(result)
 
+        token = cls._compute_unique_placeholder(fragments)
+        text, sep = cls._convert_blocks(blocks, token, doc)
+        converted = text.split(sep)
+        assert(len(converted) == len(fragments))
         return converted
 
     @classmethod
     def _store_fragment(cls, fragment):
+        profiler.count('fragments')
         idx = cls.fragment_idx.get(fragment)
         if idx is None:
+            profiler.count('unique fragments')
             idx = len(cls.fragments)
             cls.fragments.append(fragment)
             cls.fragment_idx[fragment] = idx
@@ -979,10 +1973,14 @@ class CodeElems:
         converted_fragments = cls._convert_fragments(cls.fragments, doc)
 
         # Intersperse the separator and batch convert all of the code elements at once.
-        text, sep = cls._convert_blocks(
-            [pf.Plain(elem) if isinstance(elem, pf.Code) else elem for elem in elems],
-            cls._compute_unique_placeholder(elem.text for elem in elems),
-            doc)
+        token = cls._compute_unique_placeholder(elem.text for elem in elems)
+        if doc.get_metadata('preview') and doc.format == 'html':
+            text, sep = cls._highlight(elems, token)
+        else:
+            text, sep = cls._convert_blocks(
+                [pf.Plain(elem) if isinstance(elem, pf.Code) else elem for elem in elems],
+                token,
+                doc)
 
         # The spaces in the ends are optional because of situations like:
         # `$unspecified$ f();` that ends up like ` PH  f();`, and the markdown
@@ -1001,11 +1999,18 @@ class CodeElems:
         for container, result in zip(containers, results):
             container.text = result
 
+@profiler.timed
 def finalize(doc):
+    if checking:
+        # Nothing is rendered, so there's nothing to hand back to Pandoc.
+        doc.content = []
+        return
     CodeElems.run(doc)
 
 if __name__ == '__main__':
-  pf.run_filters([
+  with profiler.phase('load'):
+    doc = load()
+  actions = [
       soul,
       wording,
       cmptable,
@@ -1016,4 +2021,12 @@ if __name__ == '__main__':
       # not necessarily after `cmptable`
       *[collect_refs, citation_link],
       *formatting,
-  ], prepare, finalize)
+  ]
+  if doc.get_metadata('check'):
+    # Only the actions that report problems, see `make <paper>.check`.
+    actions = [wording, cmptable, header, automatic_header_link, sref, divspan]
+  doc = pf.run_filters(map(profiler.action, actions), prepare, finalize, doc=doc)
+  with profiler.phase('dump'):
+    dump(doc)
+  profiler.report()
+  index.report(doc)
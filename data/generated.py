@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Keep track of the files that the build writes into a directory of its own.
+
+Usage: generated.py clean DIR...
+
+The chunked HTML papers, the mailing and the search page are each written into
+a directory, which may be next to the papers and their images in a paper's own
+directory, e.g. with `paper.mk`. The files written into each are listed in
+`MANIFEST` in it, so that only those are ever replaced or removed.
+
+`clean` removes the files listed in each DIR, and then the directories that
+are left empty. A DIR without `MANIFEST` is left as it is.
+"""
+
+import os
+import os.path
+import sys
+
+MANIFEST = '.wg21-files'
+
+def listed(directory):
+    """The files listed in `directory`, or `None` if it has no `MANIFEST`."""
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        files = f.read().splitlines()
+    # Only the files within `directory`, whatever `MANIFEST` says.
+    return [file for file in files if file and not os.path.isabs(file) and
+            os.path.normpath(file).split(os.sep)[0] != os.pardir]
+
+def write(directory, files):
+    path = os.path.join(directory, MANIFEST)
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        f.writelines(f'{file}\n' for file in sorted(files))
+    os.replace(f'{path}.tmp', path)
+
+def record(directory, files):
+    """
+    Lists the ones of `files` in `directory` that are there, along with the
+    ones listed before that still are, e.g. the assets of previous builds.
+    """
+    write(directory, {file for file in [*files, *(listed(directory) or [])]
+                      if os.path.exists(os.path.join(directory, file))})
+
+def walk(directory):
+    """The files in `directory`, relative to it."""
+    return [os.path.relpath(os.path.join(root, name), directory)
+            for root, _, names in os.walk(directory) for name in names]
+
+def remove(directory, files):
+    """Removes `files` from `directory`, and the directories left empty."""
+    parents = set()
+    for file in files:
+        try:
+            os.remove(os.path.join(directory, file))
+        except FileNotFoundError:
+            pass
+        parent = os.path.dirname(file)
+        while parent:
+            parents.add(parent)
+            parent = os.path.dirname(parent)
+    # The deepest first, so that a parent is empty once its children are gone.
+    for parent in sorted(parents, key=lambda p: -p.count(os.sep)):
+        try:
+            os.rmdir(os.path.join(directory, parent))
+        except OSError:
+            pass
+
+def install(src, dst):
+    """
+    Moves the files in `src` into `dst` and lists them there, in place of the
+    ones listed before. `dst` is only written into if it doesn't exist, is
+    empty, or has `MANIFEST`, as anything else in it isn't the build's.
+    """
+    old = listed(dst)
+    if old is None and os.path.isdir(dst) and os.listdir(dst):
+        raise FileExistsError(
+            f'{dst} already exists and was not written by the build, remove it to build into it')
+    files = walk(src)
+    for file in files:
+        os.makedirs(os.path.dirname(os.path.join(dst, file)), exist_ok=True)
+        os.replace(os.path.join(src, file), os.path.join(dst, file))
+    remove(dst, set(old or []) - set(files))
+    write(dst, files)
+
+def clean(directory):
+    files = listed(directory)
+    if files is None:
+        return
+    remove(directory, [*files, MANIFEST])
+    try:
+        os.rmdir(directory)
+    except OSError:
+        pass
+
+def main():
+    command, *directories = sys.argv[1:]
+    if command == 'clean':
+        for directory in directories:
+            clean(directory)
+    else:
+        sys.exit(f'generated: unknown command {command}')
+
+if __name__ == '__main__':
+    main()
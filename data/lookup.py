@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Complete and look up stable names and citation ids, e.g. for editors.
+
+Usage: lookup.py build DATADIR DB
+       lookup.py [--json] complete DB TEXT [LIMIT]
+       lookup.py [--json] hover DB KEY
+       lookup.py serve DB
+
+`build` writes the index DB (SQLite) from `srefs.json` and `csl.json` in
+DATADIR, once after `make update`. It has a table of the stable names and the
+citation ids with their details, indexed by the case-folded key for prefix
+queries, and a trigram index over the keys, titles and authors for substring
+queries.
+
+`complete` lists up to LIMIT (default: 20) entries for TEXT: the ones whose
+key starts with TEXT, then the ones whose key, title or authors contain it.
+TEXT may start with `[` for stable names only, or with `@` for citations only.
+
+`hover` shows the entry for the stable name or citation id KEY.
+
+`serve` answers queries on stdin, one JSON object per line, e.g.
+`{"complete": "basic.li", "limit": 10}` or `{"hover": "P2996R13"}`, with a
+JSON array of entries per line on stdout. It only opens DB once, for editor
+integrations that keep it running.
+
+The index is opened read-only and memory-mapped, so a query costs no more than
+the pages of the index that it touches.
+"""
+
+import json
+import os.path
+import sqlite3
+import sys
+
+# Up to the size of the index, which is shared with the page cache.
+MMAP_SIZE = 1 << 30
+
+SCHEMA = '''
+CREATE TABLE entries (
+  kind TEXT NOT NULL,  -- `sref` or `cite`
+  key TEXT NOT NULL,
+  fold TEXT NOT NULL,  -- `key` case-folded, for prefix queries
+  detail TEXT NOT NULL,  -- e.g. the title, the authors and the date
+  url TEXT NOT NULL
+);
+CREATE INDEX entries_fold ON entries (fold);
+'''
+
+def authors(item):
+    names = []
+    for author in item.get('author', []):
+        name = author.get('literal') or ' '.join(
+            part for part in (author.get('given'), author.get('family')) if part)
+        if name:
+            names.append(name)
+    return ', '.join(names)
+
+def detail(item):
+    parts = [item.get('title', '')]
+    if (names := authors(item)):
+        parts.append(names)
+    if (date := item.get('issued', {}).get('date-parts')):
+        parts.append('-'.join(f'{part:02}' for part in date[0]))
+    return ' — '.join(part for part in parts if part)
+
+def build(datadir, path):
+    with open(os.path.join(datadir, 'srefs.json'), 'r') as f:
+        srefs = json.load(f)
+    with open(os.path.join(datadir, 'csl.json'), 'r') as f:
+        items = json.load(f)
+
+    rows = [
+        ('sref', name, name.casefold(), f'{number} {title}',
+         f'https://eel.is/c++draft/{name}')
+        for name, (number, title) in sorted(srefs.items())
+    ] + [
+        ('cite', item['id'], item['id'].casefold(), detail(item), item.get('URL', ''))
+        for item in items
+    ]
+
+    db = sqlite3.connect(path)
+    with db:
+        db.executescript(SCHEMA)
+        db.executemany('INSERT INTO entries VALUES (?, ?, ?, ?, ?)', rows)
+        try:
+            db.execute(
+                "CREATE VIRTUAL TABLE search USING fts5("
+                "key, detail, content='entries', tokenize='trigram')")
+            db.execute("INSERT INTO search (search) VALUES ('rebuild')")
+        except sqlite3.OperationalError:
+            pass  # No FTS5 or trigram tokenizer, substrings are scanned instead.
+    db.execute('VACUUM')
+    db.close()
+
+class Index:
+    def __init__(self, path):
+        self.db = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        self.db.execute(f'PRAGMA mmap_size = {MMAP_SIZE}')
+        self.fts = self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'search'").fetchone() is not None
+
+    def entries(self, rows):
+        return [
+            {'kind': kind, 'key': key, 'detail': detail, 'url': url,
+             'text': f'[{key}]{{.sref}}' if kind == 'sref' else f'[@{key}]'}
+            for kind, key, detail, url in rows
+        ]
+
+    def complete(self, text, limit=20):
+        kinds = ('sref', 'cite')
+        if text.startswith('['):
+            kinds, text = ('sref',), text[1:]
+        elif text.startswith('@'):
+            kinds, text = ('cite',), text[1:]
+        fold = text.casefold()
+        if not fold:
+            return []
+
+        # The keys that start with `fold` are the ones in [fold, upper).
+        upper = fold[:-1] + chr(ord(fold[-1]) + 1)
+        kind = f"kind IN ({','.join('?' * len(kinds))})"
+        rows = self.db.execute(
+            f'SELECT rowid, kind, key, detail, url FROM entries '
+            f'WHERE fold >= ? AND fold < ? AND {kind} '
+            f'ORDER BY length(key), fold LIMIT ?',
+            (fold, upper, *kinds, limit)).fetchall()
+
+        if len(rows) < limit:
+            seen = [rowid for rowid, *_ in rows] or [0]
+            exclude = f"rowid NOT IN ({','.join('?' * len(seen))})"
+            if self.fts and len(fold) >= 3:
+                # Quoted, so that the text is matched as is.
+                query = '"' + text.replace('"', '""') + '"'
+                rows += self.db.execute(
+                    f'SELECT rowid, kind, key, detail, url FROM entries '
+                    f'WHERE rowid IN (SELECT rowid FROM search WHERE search MATCH ?) '
+                    f'AND {kind} AND {exclude} ORDER BY length(key), fold LIMIT ?',
+                    (query, *kinds, *seen, limit - len(rows))).fetchall()
+            else:
+                pattern = '%' + fold.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+                rows += self.db.execute(
+                    f"SELECT rowid, kind, key, detail, url FROM entries "
+                    f"WHERE (fold LIKE ? ESCAPE '\\' OR detail LIKE ? ESCAPE '\\') "
+                    f"AND {kind} AND {exclude} ORDER BY length(key), fold LIMIT ?",
+                    (pattern, pattern, *kinds, *seen, limit - len(rows))).fetchall()
+
+        return self.entries(row[1:] for row in rows)
+
+    def hover(self, key):
+        key = key.strip('[]@')
+        return self.entries(self.db.execute(
+            'SELECT kind, key, detail, url FROM entries WHERE fold = ? ORDER BY kind DESC',
+            (key.casefold(),)).fetchall())
+
+def show(entries, as_json):
+    for entry in entries:
+        if as_json:
+            print(json.dumps(entry, ensure_ascii=False))
+        else:
+            print(f'{entry["text"]:32} {entry["detail"]}')
+
+def serve(index):
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        query = json.loads(line)
+        if 'complete' in query:
+            entries = index.complete(query['complete'], query.get('limit', 20))
+        else:
+            entries = index.hover(query['hover'])
+        sys.stdout.write(json.dumps(entries, ensure_ascii=False) + '\n')
+        sys.stdout.flush()
+
+def main():
+    args = sys.argv[1:]
+    as_json = args[:1] == ['--json']
+    if as_json:
+        args = args[1:]
+
+    command, *args = args
+    if command == 'build':
+        datadir, path = args
+        build(datadir, path)
+    elif command == 'complete':
+        path, text, *limit = args
+        show(Index(path).complete(text, int(limit[0]) if limit else 20), as_json)
+    elif command == 'hover':
+        path, key = args
+        show(Index(path).hover(key), as_json)
+    elif command == 'serve':
+        path, = args
+        serve(Index(path))
+    else:
+        sys.exit(f'Unknown command: {command}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Write the index page of a mailing, built by `make mailing`.
+
+Usage: mailing.py DIR TITLE PAPER.md...
+
+Lists the papers, built into DIR as `<stem>.html`, ordered by document number,
+with the title, the authors, the audience and the date from their front matter,
+into `DIR/index.html`. The page links the stylesheets of the papers from
+`DIR/assets/defaults.yaml`, see `assets.py`.
+
+The index, the papers and their assets are then listed as the files of the
+mailing in DIR, for `make clean` to remove only those, see `generated.py`.
+"""
+
+import datetime
+import glob
+import html
+import json
+import os.path
+import re
+import sys
+
+import yaml
+
+import generated
+
+def front_matter(path):
+    """The YAML metadata block at the start of the Markdown file `path`."""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    if not lines or lines[0] != '---':
+        return {}
+    for end, line in enumerate(lines[1:], 1):
+        if line in ('---', '...'):
+            return yaml.safe_load('\n'.join(lines[1:end])) or {}
+    return {}
+
+def inline(text):
+    """`text` as HTML, with the Markdown code spans in it, e.g. in titles."""
+    return re.sub(r'`([^`]+)`', r'<code>\1</code>', html.escape(str(text)))
+
+def listed(value):
+    return value if isinstance(value, list) else [] if value is None else [value]
+
+def natural(document):
+    """Orders document numbers by their numbers, e.g. P998R0 before P2996R0."""
+    return [int(part) if part.isdigit() else part for part in re.split(r'([0-9]+)', document)]
+
+def main():
+    directory, title, *papers = sys.argv[1:]
+
+    rows = []
+    for paper in papers:
+        meta = front_matter(paper)
+        document = str(meta.get('document', '')).upper()
+        date = meta.get('date', '')
+        if date == 'today':
+            date = datetime.date.today().isoformat()
+        authors = [author.get('name', '') if isinstance(author, dict) else author
+                   for author in listed(meta.get('author'))]
+        stem = os.path.splitext(os.path.basename(paper))[0]
+        rows.append((natural(document or stem), f'''    <tr>
+      <td><a href="{html.escape(stem)}.html">{html.escape(document or stem)}</a></td>
+      <td>{inline(meta.get('title', ''))}</td>
+      <td>{'<br>'.join(inline(author) for author in authors)}</td>
+      <td>{'<br>'.join(inline(audience) for audience in listed(meta.get('audience')))}</td>
+      <td>{html.escape(str(date))}</td>
+    </tr>'''))
+
+    # JSON is valid YAML.
+    with open(os.path.join(directory, 'assets', 'defaults.yaml'), 'r') as f:
+        assets = json.load(f)['metadata']['assets']
+    links = [f'  <link rel="stylesheet" href="{css}" />' for css in assets['css']]
+    links.append(f'  <link rel="icon" href="{assets["favicon"]}" />')
+
+    nl = '\n'
+    page = f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8" />
+  <meta name="generator" content="mpark/wg21" />
+  <meta name="viewport" content="width=device-width, initial-scale=1.0, user-scalable=yes" />
+  <title>{html.escape(title)}</title>
+{nl.join(links)}
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+<table>
+  <thead>
+    <tr>
+      <th>Document</th>
+      <th>Title</th>
+      <th>Author</th>
+      <th>Audience</th>
+      <th>Date</th>
+    </tr>
+  </thead>
+  <tbody>
+{nl.join(row for _, row in sorted(rows))}
+  </tbody>
+</table>
+</body>
+</html>
+'''
+    path = os.path.join(directory, 'index.html')
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        f.write(page)
+    os.replace(f'{path}.tmp', path)
+
+    # The papers with their siblings, e.g. `p2806r4.html.profile.json`.
+    files = ['index.html', 'assets/defaults.yaml', *assets['css'], assets['favicon']]
+    for paper in papers:
+        stem = glob.escape(os.path.splitext(os.path.basename(paper))[0])
+        files += [os.path.relpath(path, directory)
+                  for path in glob.glob(os.path.join(directory, f'{stem}.html*'))]
+    generated.record(directory, files)
+
+if __name__ == '__main__':
+    main()
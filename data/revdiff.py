@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Diff two revisions of a paper, built by `make <paper>.diff.html`.
+
+Usage: revdiff.py OUT BASE PAPER CMD...
+
+Reads BASE and PAPER with the `pandoc` command CMD, which writes the Pandoc
+AST as JSON, and writes the AST of PAPER with the changes from BASE marked up
+into OUT, to be rendered like any other paper. If BASE is `-`, it's the
+previous revision of PAPER next to it, e.g. `p2806r3.md` for `p2806r4.md`.
+
+The blocks are matched by their content first, and only the blocks that
+changed are diffed further, so that the unchanged bulk of a long paper costs
+only a hash:
+
+  - Removed and added blocks are put in `::: rm` and `::: add` divs.
+  - Paragraphs, headers, divs, quotes and lists that changed are diffed
+    within, with the removed and added text in `[]{.rm}` and `[]{.add}` spans.
+  - Code blocks that changed are shown as `diff` code blocks, which keep
+    their classes after `diff`, e.g. `cpp` for its `@` and `$` fragments.
+
+OUT is only written if it changed, so that the paper is only rendered again
+if either of the revisions changed.
+"""
+
+import difflib
+import hashlib
+import json
+import os.path
+import re
+import subprocess
+import sys
+
+# Changed blocks less similar than this are shown as removed and added whole.
+SIMILARITY = 0.5
+
+def key(elem):
+    return hashlib.blake2b(
+        json.dumps(elem, separators=(',', ':'), ensure_ascii=False).encode('utf-8'),
+        digest_size=16).digest()
+
+def shape(block):
+    """The blocks that can be diffed within each other have the same shape."""
+    t, c = block['t'], block.get('c')
+    if t == 'Header':
+        return (t, c[0])
+    if t in ('Div', 'CodeBlock'):
+        return (t, tuple(c[0][1]))
+    return (t,)
+
+def attr(classes, old=('', [], [])):
+    """The attributes `old`, with `classes` in place of its classes."""
+    return [old[0], classes, old[2]]
+
+def disarm(elem):
+    """Removes the ids of the headers in removed blocks, which PAPER may reuse."""
+    if isinstance(elem, list):
+        for child in elem:
+            disarm(child)
+    elif isinstance(elem, dict):
+        if elem.get('t') == 'Header':
+            elem['c'][1] = attr(elem['c'][1][1] + ['unnumbered', 'unlisted'])
+        disarm(elem.get('c'))
+    return elem
+
+def removed(blocks):
+    return {'t': 'Div', 'c': [attr(['rm']), disarm(blocks)]}
+
+def added(blocks):
+    return {'t': 'Div', 'c': [attr(['add']), blocks]}
+
+def diff_inlines(old, new):
+    result = []
+    matcher = difflib.SequenceMatcher(None, [key(i) for i in old], [key(i) for i in new], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            result.extend(new[j1:j2])
+            continue
+        if i1 < i2:
+            result.append({'t': 'Span', 'c': [attr(['rm']), old[i1:i2]]})
+        if j1 < j2:
+            result.append({'t': 'Span', 'c': [attr(['add']), new[j1:j2]]})
+    return result, matcher.ratio()
+
+def diff_code(old, new):
+    old_lines, new_lines = old.splitlines(), new.splitlines()
+    lines = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            lines.extend(f' {line}' for line in new_lines[j1:j2])
+            continue
+        lines.extend(f'-{line}' for line in old_lines[i1:i2])
+        lines.extend(f'+{line}' for line in new_lines[j1:j2])
+    return '\n'.join(lines)
+
+def diff_items(old, new):
+    """The items of two lists, each a list of blocks."""
+    result = []
+    matcher = difflib.SequenceMatcher(None, [key(i) for i in old], [key(i) for i in new], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            result.extend(new[j1:j2])
+            continue
+        for o, n in zip(old[i1:i2], new[j1:j2]):
+            result.append(diff_blocks(o, n))
+        result.extend([removed(o)] for o in old[i1 + (j2 - j1):i2])
+        result.extend([added(n)] for n in new[j1 + (i2 - i1):j2])
+    return result
+
+def diff_block(old, new):
+    """The blocks that show the changes from `old` to `new`, of the same shape."""
+    t, o, n = new['t'], old.get('c'), new.get('c')
+    if t in ('Para', 'Plain'):
+        content, ratio = diff_inlines(o, n)
+        if ratio >= SIMILARITY:
+            return [{'t': t, 'c': content}]
+    elif t == 'Header':
+        content, ratio = diff_inlines(o[2], n[2])
+        if ratio >= SIMILARITY:
+            return [{'t': t, 'c': [n[0], n[1], content]}]
+    elif t == 'Div':
+        return [{'t': t, 'c': [n[0], diff_blocks(o[1], n[1])]}]
+    elif t == 'BlockQuote':
+        return [{'t': t, 'c': diff_blocks(o, n)}]
+    elif t == 'BulletList':
+        return [{'t': t, 'c': diff_items(o, n)}]
+    elif t == 'OrderedList':
+        return [{'t': t, 'c': [n[0], diff_items(o[1], n[1])]}]
+    elif t == 'CodeBlock':
+        return [{'t': t, 'c': [attr(['diff', *n[0][1]], n[0]), diff_code(o[1], n[1])]}]
+    return [removed([old]), added([new])]
+
+def diff_blocks(old, new):
+    result = []
+    matcher = difflib.SequenceMatcher(None, [key(b) for b in old], [key(b) for b in new], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            result.extend(new[j1:j2])
+        elif tag == 'delete':
+            result.append(removed(old[i1:i2]))
+        elif tag == 'insert':
+            result.append(added(new[j1:j2]))
+        else:
+            # Only the changed blocks are matched again, by their shape.
+            olds, news = old[i1:i2], new[j1:j2]
+            shapes = difflib.SequenceMatcher(
+                None, [shape(b) for b in olds], [shape(b) for b in news], autojunk=False)
+            for tag, k1, k2, l1, l2 in shapes.get_opcodes():
+                if tag == 'equal':
+                    for o, n in zip(olds[k1:k2], news[l1:l2]):
+                        result.extend(diff_block(o, n))
+                    continue
+                if k1 < k2:
+                    result.append(removed(olds[k1:k2]))
+                if l1 < l2:
+                    result.append(added(news[l1:l2]))
+    return result
+
+def previous(paper):
+    """The previous revision next to `paper`, e.g. `p2806r3.md` for `p2806r4.md`."""
+    stem, ext = os.path.splitext(paper)
+    match = re.fullmatch(r'(.*[rR])([0-9]+)', stem)
+    if match is not None:
+        prefix, revision = match.groups()
+        for r in range(int(revision) - 1, -1, -1):
+            if os.path.exists(f'{prefix}{r}{ext}'):
+                return f'{prefix}{r}{ext}'
+    sys.exit(f'revdiff: no previous revision of {paper} found, set DIFF_BASE')
+
+def read(cmd, path):
+    return json.loads(subprocess.run([*cmd, path], check=True, stdout=subprocess.PIPE).stdout)
+
+def main():
+    out, base, paper, *cmd = sys.argv[1:]
+    if base == '-':
+        base = previous(paper)
+
+    old, new = read(cmd, base), read(cmd, paper)
+    new['blocks'] = diff_blocks(old['blocks'], new['blocks'])
+    content = json.dumps(new, separators=(',', ':'), ensure_ascii=False)
+
+    if os.path.exists(out):
+        with open(out, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return
+    with open(f'{out}.tmp', 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(f'{out}.tmp', out)
+    print(f'revdiff: {base} -> {paper}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Build the client-side search index of the papers, built by `make search`.
+
+Usage: search.py DIR INDEX.json...
+
+Reads the `sections` of each paper from its index (see `INDEX` in `flat.mk` and
+`Index` in `wg21.py`), and writes into DIR:
+
+  - `index.html`: the search page, from `templates/search.html`.
+  - `manifest.json`: the document number, the title and the URL of each paper,
+    by the id of the paper.
+  - `papers/<id>.json`: the id and the heading of each section of a paper,
+    only fetched to show the results in it.
+  - `terms/<prefix>.json`: the postings of the terms that start with
+    `<prefix>`, the first 3 characters of the term. A posting is
+    `[paper, section, kinds]`, where `kinds` is a bitmask of where the term is
+    in the section: the heading (1), the stable names (2), the code (4) and the
+    wording (8).
+
+A query only fetches `manifest.json` and a shard per term, which are small
+enough to be searched in a few milliseconds.
+
+`state.json` records the hash of each paper's index, and the shards its terms
+are in. Only the papers whose index changed are read again, and only the shards
+that they were or are in are written again.
+
+The files are listed as the ones of the search page in DIR, for `make clean` to
+remove only those, see `generated.py`.
+"""
+
+import hashlib
+import json
+import os
+import os.path
+import re
+import shutil
+import sys
+
+import generated
+
+HEADING, SREF, CODE, WORDING = 1, 2, 4, 8
+
+# Too common in wording to tell sections apart. Kept in code and headings.
+STOP_WORDS = set('''
+a an and are as at be by for from has if in is it its of on or shall such that
+the this to which with
+'''.split())
+
+def words(text):
+    """The terms of text. `tokenize` in `templates/search.html` must agree."""
+    return re.findall(r'[a-z0-9_]+', text.lower())
+
+def terms(section):
+    """The terms of `section` and the kinds they're found as."""
+    found = {}
+    def add(terms, kind, stop=False):
+        for term in terms:
+            if len(term) > 1 and not (stop and term in STOP_WORDS):
+                found[term] = found.get(term, 0) | kind
+
+    add(words(section['heading']), HEADING)
+    add((name.lower() for name in section['srefs']), SREF)
+    add((word for code in section['code'] for word in words(code)
+         if not word.isdigit()), CODE)
+    add((word for text in section['wording'] for word in words(text)), WORDING, stop=True)
+    return found
+
+def shard(term):
+    return term[:3]
+
+def read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_json(path, value):
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(value, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(f'{path}.tmp', path)
+
+def main():
+    directory, *indexes = sys.argv[1:]
+    os.makedirs(os.path.join(directory, 'papers'), exist_ok=True)
+    os.makedirs(os.path.join(directory, 'terms'), exist_ok=True)
+
+    state_path = os.path.join(directory, 'state.json')
+    state = read_json(state_path, {'next': 0, 'papers': {}})
+    papers = state['papers']
+
+    # The papers to remove the postings of, and to add the postings of.
+    removed = {}
+    added = {}
+    current = {}
+    for path in indexes:
+        # e.g. `p2806r4.html.index.json` is the index of `p2806r4.html`.
+        output = os.path.basename(path)[:-len('.index.json')]
+        current[output] = path
+        with open(path, 'rb') as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        paper = papers.get(output)
+        if paper is not None and paper['hash'] == digest:
+            continue
+        if paper is not None:
+            removed[paper['id']] = paper['shards']
+            id = paper['id']
+        else:
+            id = state['next']
+            state['next'] += 1
+
+        index = json.loads(content)
+        sections = [section for section in index['sections'] if section['id'] is not None]
+        postings = {}
+        for i, section in enumerate(sections):
+            for term, kinds in terms(section).items():
+                postings.setdefault(term, []).append([id, i, kinds])
+        added[id] = postings
+
+        papers[output] = {
+            'id': id,
+            'hash': digest,
+            'document': index['document'],
+            'title': index['title'],
+            'shards': sorted({shard(term) for term in postings}),
+        }
+        write_json(os.path.join(directory, 'papers', f'{id}.json'),
+                   [[section['id'], section['heading']] for section in sections])
+
+    for output in set(papers) - set(current):
+        paper = papers.pop(output)
+        removed[paper['id']] = paper['shards']
+        os.remove(os.path.join(directory, 'papers', f'{paper["id"]}.json'))
+
+    # Only the shards that the changed papers were or are in.
+    shards = {key: {} for keys in removed.values() for key in keys}
+    for postings in added.values():
+        for term, entries in postings.items():
+            shards.setdefault(shard(term), {}).setdefault(term, []).extend(entries)
+    for key, new in sorted(shards.items()):
+        path = os.path.join(directory, 'terms', f'{key}.json')
+        postings = read_json(path, {})
+        for term in list(postings):
+            postings[term] = [p for p in postings[term] if p[0] not in removed]
+        for term, entries in new.items():
+            postings.setdefault(term, []).extend(entries)
+        postings = {term: entries for term, entries in sorted(postings.items()) if entries}
+        if postings:
+            write_json(path, postings)
+        elif os.path.exists(path):
+            os.remove(path)
+
+    write_json(os.path.join(directory, 'manifest.json'), {
+        paper['id']: [paper['document'], paper['title'], f'../{output}']
+        for output, paper in sorted(papers.items())
+    })
+    write_json(state_path, state)
+
+    datadir = os.path.dirname(os.path.abspath(__file__))
+    shutil.copyfile(os.path.join(datadir, 'templates', 'search.html'),
+                    os.path.join(directory, 'index.html'))
+    generated.record(directory, [
+        'index.html', 'manifest.json', 'state.json',
+        *(f'papers/{paper["id"]}.json' for paper in papers.values()),
+        *(f'terms/{key}.json' for key in sorted({key for paper in papers.values() for key in paper['shards']})),
+    ])
+
+    print(f'search: {len(added)} papers indexed, {len(removed) - len(set(removed) & set(added))} '
+          f'removed, {len(shards)} shards written, {len(papers)} papers in total')
+
+if __name__ == '__main__':
+    main()
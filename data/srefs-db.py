@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Generate the store of the stable names (SQLite) of the current working draft,
+from srefs.json, and of the pinned editions of it.
+
+Usage: srefs-db.py SRC DST OLD [EDITION[=FILE]...]
+
+The current working draft is the edition `draft`, and the others are the
+pinned editions EDITION, e.g. `n4950`. They never change once published, so
+the ones already in the store OLD that DST replaces are kept as they are, and
+the others are fetched with `srefs.py`, or read from FILE, in the format of
+srefs.json.
+
+Most stable names have the same number and title in many editions, so each
+one is stored once, with a bitmask of the editions it's in. A lookup in one
+edition is then a lookup by name like with a single edition.
+"""
+
+import json
+import os.path
+import sqlite3
+import sys
+
+SCHEMA = '''
+CREATE TABLE editions (
+  edition TEXT PRIMARY KEY,
+  bit INTEGER NOT NULL UNIQUE
+) WITHOUT ROWID;
+CREATE TABLE srefs (
+  name TEXT NOT NULL,
+  number TEXT NOT NULL,
+  title TEXT NOT NULL,
+  editions INTEGER NOT NULL,  -- the bitmask of the editions, by their `bit`
+  PRIMARY KEY (name, number, title)
+) WITHOUT ROWID;
+'''
+
+DRAFT = 'draft'
+
+# The bits of an SQLite integer, without the sign bit.
+MAX_EDITIONS = 63
+
+def read(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def kept(path):
+    """The stable names of the pinned editions in the store at `path`."""
+    if not os.path.exists(path):
+        return {}
+    db = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        editions = dict(db.execute('SELECT edition, bit FROM editions WHERE edition != ?', (DRAFT,)))
+        srefs = {edition: {} for edition in editions}
+        for name, number, title, mask in db.execute('SELECT name, number, title, editions FROM srefs'):
+            for edition, bit in editions.items():
+                if mask & (1 << bit):
+                    srefs[edition][name] = [number, title]
+        return srefs
+    except sqlite3.OperationalError:
+        return {}  # A store of a single edition, from before the editions.
+    finally:
+        db.close()
+
+def main():
+    src, dst, old, *pinned = sys.argv[1:]
+
+    old = kept(old)
+    editions = {DRAFT: read(src)}
+    for arg in pinned:
+        edition, _, path = arg.partition('=')
+        edition = edition.lower()
+        if path:
+            editions[edition] = read(path)
+        elif edition in old:
+            editions[edition] = old[edition]
+        else:
+            import srefs
+            print(f'srefs-db: fetching the stable names of {edition}', file=sys.stderr)
+            editions[edition] = srefs.fetch(edition)
+
+    if len(editions) > MAX_EDITIONS:
+        sys.exit(f'srefs-db: at most {MAX_EDITIONS - 1} editions can be pinned')
+
+    bits = {edition: bit for bit, edition in enumerate([DRAFT, *sorted(set(editions) - {DRAFT})])}
+    masks = {}
+    for edition, srefs in editions.items():
+        for name, (number, title) in srefs.items():
+            masks[name, number, title] = masks.get((name, number, title), 0) | (1 << bits[edition])
+
+    db = sqlite3.connect(dst)
+    with db:
+        db.executescript(SCHEMA)
+        db.executemany('INSERT INTO editions VALUES (?, ?)', bits.items())
+        db.executemany(
+            'INSERT INTO srefs VALUES (?, ?, ?, ?)',
+            ((name, number, title, mask) for (name, number, title), mask in sorted(masks.items())))
+    db.execute('VACUUM')
+    db.close()
+
+if __name__ == '__main__':
+    main()
@@ -7,10 +7,16 @@
 # Distributed under the Boost Software License, Version 1.0.
 # (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
 
-"""Generate Markdown link definitions from srefs.json."""
+"""
+Generate Markdown link definitions from srefs.db, for the stable names of all
+of its editions.
 
-import json
+Usage: srefs-md.py SRC
+"""
+
+import sqlite3
 import sys
 
-for stable_name in json.load(sys.stdin):
+db = sqlite3.connect(f'file:{sys.argv[1]}?mode=ro', uri=True)
+for stable_name, in db.execute('SELECT DISTINCT name FROM srefs ORDER BY name'):
     print(f'[{stable_name}]: {{.sref}}')
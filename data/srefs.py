@@ -7,7 +7,15 @@
 # Distributed under the Boost Software License, Version 1.0.
 # (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
 
-"""Extract stable names from eel.is/c++draft."""
+"""
+Extract stable names from eel.is/c++draft.
+
+Usage: srefs.py [EDITION]
+
+Prints the number and the title of each stable name of the current working
+draft as JSON, or of the working draft EDITION, e.g. `n4950`, as published at
+timsong-cpp.github.io/cppwp. See `srefs-db.py` for the store of the editions.
+"""
 
 from bs4 import BeautifulSoup
 import json
@@ -17,6 +25,7 @@ import subprocess
 import sys
 
 url = 'https://eel.is/c++draft'
+edition_url = 'https://timsong-cpp.github.io/cppwp/{}'
 
 def rows(html):
     def normalize(text):
@@ -38,14 +47,16 @@ def rows(html):
         title = normalize(heading.get_text())
         yield div['id'], number, title
 
+def fetch(edition=None):
+    """The stable names of the current working draft, or of `edition`."""
+    html = subprocess.check_output(
+        ['curl', '-fsSL', url if edition is None else edition_url.format(edition)], text=True)
+    return {stable_name: [number, title] for stable_name, number, title in rows(html)}
+
 def main():
     signal.signal(signal.SIGPIPE, signal.SIG_DFL)
 
-    html = subprocess.check_output(['curl', '-fsSL', url], text=True)
-    json.dump({stable_name: [number, title]
-               for stable_name, number, title in rows(html)},
-              sys.stdout,
-              separators=(',', ':'))
+    json.dump(fetch(*sys.argv[1:2]), sys.stdout, separators=(',', ':'))
     print()
 
 if __name__ == '__main__':
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Generate the index of the stable names and the citation ids (SQLite) from
+srefs.db and csl.json, which `wg21.py` suggests the closest matches from when
+a stable name or a citation is not found.
+
+Usage: suggest-db.py DATADIR DST
+
+Each name is indexed by its trigrams, so the candidates for a name are the ones
+that share the most trigrams with it, rather than all of them.
+
+Each stable name has the bitmask of the editions of the working draft it's in,
+the same as in srefs.db, see `srefs-db.py`, so that a paper that pins an
+edition is only suggested the stable names in it. The citation ids are in all
+of them.
+"""
+
+import json
+import os.path
+import sqlite3
+import sys
+
+SCHEMA = '''
+CREATE TABLE names (
+  id INTEGER PRIMARY KEY,
+  kind TEXT NOT NULL,  -- `sref` or `cite`
+  name TEXT NOT NULL,
+  size INTEGER NOT NULL,  -- the number of trigrams of `name`
+  editions INTEGER NOT NULL  -- the bitmask of the editions, as in srefs.db
+);
+CREATE TABLE grams (
+  gram TEXT NOT NULL,
+  kind TEXT NOT NULL,
+  id INTEGER NOT NULL,
+  PRIMARY KEY (gram, kind, id)
+) WITHOUT ROWID;
+'''
+
+# Every edition, the bits of an SQLite integer without the sign bit.
+ALL_EDITIONS = (1 << 63) - 1
+
+def trigrams(name):
+    """The trigrams of `name`, case-folded. Same as `trigrams` in `wg21.py`."""
+    padded = f'\0{name.casefold()}\0'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def main():
+    datadir, dst = sys.argv[1:]
+
+    editions = {}
+    db = sqlite3.connect(f"file:{os.path.join(datadir, 'srefs.db')}?mode=ro", uri=True)
+    try:
+        # A stable name may be in several rows, with different numbers or titles.
+        for name, mask in db.execute('SELECT name, editions FROM srefs'):
+            editions['sref', name] = editions.get(('sref', name), 0) | mask
+    finally:
+        db.close()
+    with open(os.path.join(datadir, 'csl.json'), 'r') as f:
+        editions.update((('cite', item['id']), ALL_EDITIONS) for item in json.load(f))
+    names = sorted(editions)
+
+    db = sqlite3.connect(dst)
+    with db:
+        db.executescript(SCHEMA)
+        grams = [trigrams(name) for _, name in names]
+        db.executemany(
+            'INSERT INTO names VALUES (?, ?, ?, ?, ?)',
+            ((id, kind, name, len(grams[id]), editions[kind, name])
+             for id, (kind, name) in enumerate(names)))
+        db.executemany(
+            'INSERT INTO grams VALUES (?, ?, ?)',
+            ((gram, kind, id) for id, (kind, _) in enumerate(names) for gram in grams[id]))
+    db.execute('VACUUM')
+    db.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Record and summarize the time each build spends in each stage.
+
+Usage: timings.py record TIMINGS TARGET CMD...
+       timings.py summary TIMINGS
+
+`record` runs the `pandoc` command CMD with `--verbose`, and appends a JSON
+record for TARGET to TIMINGS. Pandoc logs when each filter starts and
+completes, so the stages are split at the time those lines arrive:
+
+  - `read`: From the start until the first filter, mostly Markdown parsing.
+  - One stage per filter, e.g. `citeproc` and `wg21.py`.
+  - `write`: From the last filter until the PDF engine starts, or the end.
+  - `pdf`: The PDF engine, e.g. `xelatex`.
+
+The verbose log is only shown if the command fails, other messages are passed
+through.
+
+`summary` ranks the papers by their latest build time, and the stages by
+their time summed over all of the papers.
+"""
+
+import datetime
+import json
+import os.path
+import re
+import subprocess
+import sys
+import time
+
+def record(timings, target, cmd):
+    start = time.perf_counter()
+    proc = subprocess.Popen([*cmd, '--verbose'], stderr=subprocess.PIPE, text=True)
+
+    stages = {}
+    stage, since = 'read', start
+    def mark(name):
+        nonlocal stage, since
+        now = time.perf_counter()
+        stages[stage] = stages.get(stage, 0) + now - since
+        stage, since = name, now
+
+    previous = None
+    log = []
+    verbose = False
+    for line in proc.stderr:
+        if line.startswith('['):
+            verbose = line.startswith(('[INFO]', '[makePDF]'))
+        if verbose:
+            log.append(line)
+        else:
+            sys.stderr.write(line)
+
+        if (match := re.match(r'\[INFO\] Running filter (.+)', line)):
+            # Pandoc reads a filter's output after it completes, so the gap
+            # until the next filter belongs to the previous one, not `write`.
+            if stage == 'write':
+                stage = previous
+            mark(os.path.basename(match.group(1)))
+        elif line.startswith('[INFO] Completed filter'):
+            previous = stage
+            mark('write')
+        elif line.startswith('[makePDF]') and stage != 'pdf':
+            mark('pdf')
+
+    returncode = proc.wait()
+    mark(None)
+    if returncode != 0:
+        # The error may have been taken for a continuation of a verbose message.
+        sys.stderr.writelines(log)
+        sys.exit(returncode)
+
+    with open(timings, 'a') as f:
+        f.write(json.dumps({
+            'target': os.path.abspath(target),
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'total': round(time.perf_counter() - start, 3),
+            'stages': {name: round(elapsed, 3) for name, elapsed in stages.items()},
+        }) + '\n')
+
+def summary(timings):
+    latest = {}
+    with open(timings, 'r') as f:
+        for line in f:
+            entry = json.loads(line)
+            latest[entry['target']] = entry
+
+    names = []
+    totals = {}
+    for entry in latest.values():
+        for name, elapsed in entry['stages'].items():
+            if name not in names:
+                names.append(name)
+            totals[name] = totals.get(name, 0) + elapsed
+
+    def display(target):
+        path = os.path.relpath(target)
+        return target if path.startswith('..') else path
+
+    width = max([len('paper'), *(len(display(target)) for target in latest)])
+    print(f'{"paper":{width}} {"total":>8}', *(f'{name:>13}' for name in names))
+    for target, entry in sorted(latest.items(), key=lambda kv: -kv[1]['total']):
+        print(f'{display(target):{width}} {entry["total"]:8.3f}',
+              *(f'{entry["stages"].get(name, 0):13.3f}' for name in names))
+
+    total = sum(totals.values())
+    print()
+    print(f'{"stage":13} {"total":>8} {"share":>6}')
+    for name, elapsed in sorted(totals.items(), key=lambda kv: -kv[1]):
+        print(f'{name:13} {elapsed:8.3f} {elapsed / total:6.1%}')
+
+def main():
+    command, timings, *args = sys.argv[1:]
+    if command == 'record':
+        target, *cmd = args
+        record(timings, target, cmd)
+    elif command == 'summary':
+        summary(timings)
+    else:
+        sys.exit(f'Unknown command: {command}')
+
+if __name__ == '__main__':
+    main()
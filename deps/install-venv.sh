@@ -24,4 +24,8 @@ python3 -m venv "${PYTHON_DIR}"
 
 "${PYTHON_DIR}/bin/python3" -m pip install --upgrade pip "$@"
 
+# Every filter run starts a new interpreter, so make sure it never has to
+# compile the dependencies, e.g. if `pip` was configured with `--no-compile`.
+"${PYTHON_DIR}/bin/python3" -m compileall -q "${PYTHON_DIR}"
+
 trap - EXIT
@@ -19,10 +19,39 @@
 #   make p2806r4.latex # builds generated/p2806r4.latex from p2806r4.md
 #   make p2806r4.pdf   # builds generated/p2806r4.pdf from p2806r4.md
 #
+#   make p2806r4.preview.html
+#                      # builds a draft preview into generated/p2806r4.preview.html,
+#                      # see data/defaults/preview.yaml
+#
+#   make p2806r4/index.html
+#                      # builds generated/p2806r4/index.html and a page per section,
+#                      # see data/defaults/chunked.yaml
+#
+#   make p2806r4.check # validates p2806r4.md without rendering it, see data/check.py
+#
+#   make p2806r4.diff.html
+#                      # builds the changes from the previous revision, p2806r3.md,
+#                      # into generated/p2806r4.diff.html, see DIFF_BASE below
+#
 #   make               # builds all the papers in HTML format (default)
 #   make html          # builds all the papers in HTML format
+#   make preview       # builds draft previews of all the papers
+#   make chunked       # builds all the papers in chunked HTML format
 #   make latex         # builds all the papers in LaTeX format
 #   make pdf           # builds all the papers in PDF format
+#   make compress      # writes gzip and brotli siblings of the HTML papers
+#   make mailing       # builds all the papers and an index page as a mailing
+#                      # into generated/mailing, see MAILING below
+#   make search        # builds a search page over all the papers into
+#                      # generated/search, see data/search.py
+#
+#   make lookup        # builds the completion index of stable names and
+#                      # citations for editors, see data/lookup.py
+#
+#   make bundle        # packs the databases of `make update` into a bundle
+#                      # named after their snapshot date, see data/bundle.py
+#   make install-bundle BUNDLE=wg21-data-2026-06-01.tar.xz
+#                      # installs the databases of a bundle without network access
 #
 #   make clean         # deletes generated files
 #
@@ -41,15 +70,121 @@
 #
 #     Passed to Python virtual env to install additional packages.
 #     If a top-level `requirements.txt` file exists, it will be used automatically.
+#
+#   - CITATIONS := native
+#
+#     Render citations and references from the indexed reference store
+#     rather than running `citeproc` over all of `csl.json` (default: citeproc).
+#
+#   - PROFILE := 1
+#
+#     Instrument the `wg21.py` filter, and write a JSON report of where its time
+#     is spent next to each output, e.g. `p2806r4.html.profile.json`.
+#
+#   - INDEX := 1
+#
+#     Write a JSON index of the headings, the paragraph numbers, the notes and
+#     examples, the stable name references and the citations of each paper
+#     next to each output, e.g. `p2806r4.html.index.json`, for other tools to
+#     use rather than parsing the output. See `Index` in `data/filters/wg21.py`.
+#
+#   - TIMINGS := <path/to/timings.jsonl>
+#
+#     Append the time each build spends in each stage (Markdown parsing, each
+#     filter, the writer and the PDF engine) to the specified file.
+#     `make timings` ranks the papers and their stages from it.
+#
+#   - FORKSERVER := 1
+#
+#     Run the `wg21.py` filter of each build in a child forked from a server of
+#     the current user, which has imported `panflute` and the other modules and
+#     compiled `wg21.py` once, rather than in a fresh interpreter. Only that is
+#     shared: each build still opens the databases and processes its paper in
+#     a fresh fork. The first build starts the server in the background, and
+#     it exits once it's been idle for 10 minutes. Builds fall back to running
+#     `wg21.py` as usual without it. See `data/filters/forkserver.py`.
+#
+#   - ASSETS := <path/to/assets>
+#
+#     Write the stylesheets and the icon once into the specified directory,
+#     relative to the HTML output, with content-hashed names, and link them
+#     from each paper rather than embedding them, e.g. `ASSETS := assets`.
+#
+#   - MINIFY := 1
+#
+#     Minify the HTML output, keeping the whitespace in `pre` and `code`
+#     elements and all attributes. `make compress` then writes gzip and brotli
+#     siblings of each HTML output, e.g. `p2806r4.html.gz` and `p2806r4.html.br`.
+#
+#   - CHECK_FORMAT := json
+#
+#     Print the diagnostics of `make <paper>.check` as JSON lines rather than
+#     as `FILE:LINE:COLUMN: warning: MESSAGE` (default: text).
+#
+#   - RESOURCE_CACHE := <path/to/cache>
+#
+#     Cache the remote images that the papers reference in the specified
+#     directory, and embed them from there rather than fetching them on every
+#     build. They're revalidated once they expire, and used as they are when
+#     the network isn't available. Not used for the HTML output that isn't
+#     self-contained, i.e. with ASSETS, previews and chunked builds.
+#
+#   - RESOURCE_CACHE_SIZE := <MiB>
+#
+#     Remove the least recently used resources from RESOURCE_CACHE once it
+#     is over the specified size (default: 100).
+#
+#   - SREFS_EDITIONS := <edition>...
+#
+#     Fetch the stable names of the specified editions of the working draft,
+#     e.g. `n4950`, for the papers that pin one with `working-draft: N4950` in
+#     their metadata. Published editions are fetched once and kept by
+#     `make update`. `<edition>=<path/to/srefs.json>` reads an edition from a
+#     file in the format of `srefs.json` instead. See `data/srefs-db.py`.
+#
+#   - DIFF_BASE := <path/to/paper.md>
+#
+#     Diff `make <paper>.diff.html` from the specified revision instead of the
+#     previous revision next to the paper, e.g. `p2806r3.md` for `p2806r4.md`.
+#     The unchanged blocks are matched by their content, and only the changed
+#     ones are diffed further, with the `add` and `rm` classes and `diff` code
+#     blocks. See `data/revdiff.py`.
+#
+#   - MAILING := <path/to/directory>
+#
+#     Build `make mailing` to the specified directory instead of
+#     `$(OUTDIR)/mailing`. The papers are built in parallel with the work
+#     that they'd otherwise each repeat done once: the stylesheets are written
+#     once into `assets` (see ASSETS) rather than embedded in every paper, the
+#     citations are rendered from the indexed reference store (see CITATIONS)
+#     rather than by `citeproc` loading all of `csl.json` for every paper, and
+#     the filters are forked from one server with their imports done (see
+#     FORKSERVER). `index.html` lists the papers by document number.
+#
+#   - MAILING_TITLE := <title>
+#
+#     The title of the mailing's `index.html` (default: Mailing).
+#
+#   - MAILING_JOBS := <n>
+#
+#     The number of papers `make mailing` builds at once (default: the number
+#     of cores).
 
 OUTDIR ?= generated
 
 DEFAULTS ?= $(wildcard defaults.yaml)
 REQUIREMENTS ?= $(wildcard requirements.txt)
 
+MAILING ?= $(OUTDIR)/mailing
+MAILING_TITLE ?= Mailing
+MAILING_JOBS ?= $(shell getconf _NPROCESSORS_ONLN 2>/dev/null || echo 1)
+
 override SRC := $(filter-out CHANGELOG.md LICENSE.md README.md, $(wildcard *.md))
 
 override HTML := $(SRC:.md=.html)
+override PREVIEW := $(SRC:.md=.preview.html)
+override DIFF := $(SRC:.md=.diff.html)
+override CHUNKED := $(SRC:.md=/index.html)
 override LATEX := $(SRC:.md=.latex)
 override PDF := $(SRC:.md=.pdf)
 
@@ -59,30 +194,74 @@ all: $(HTML)
 .PHONY: html
 html: $(HTML)
 
+.PHONY: preview
+preview: $(PREVIEW)
+
+.PHONY: chunked
+chunked: $(CHUNKED)
+
 .PHONY: latex
 latex: $(LATEX)
 
+.PHONY: compress
+compress: $(addprefix $(OUTDIR)/, $(HTML:=.gz) $(HTML:=.br))
+
 .PHONY: pdf
 pdf: $(PDF)
 
+# A separate make, since the papers of a mailing are built with ASSETS,
+# CITATIONS and FORKSERVER of its own, and into a directory of its own.
+.PHONY: mailing
+mailing:
+	@$(MAKE) -f $(firstword $(MAKEFILE_LIST)) -j $(MAILING_JOBS) \
+		OUTDIR=$(MAILING) ASSETS=assets CITATIONS=native FORKSERVER=1 $(MAILING)/index.html
+
+# A separate make, since the search index is fed from the index of each paper.
+.PHONY: search
+search:
+	@$(MAKE) -f $(firstword $(MAKEFILE_LIST)) INDEX=1 $(OUTDIR)/search/manifest.json
+
 include $(dir $(lastword $(MAKEFILE_LIST)))base.mk
 
 .PHONY: clean
 
+# Only the files that the build listed in the directories it wrote into, which
+# may be the author's own next to the papers, see `data/generated.py`.
+override CLEAN_GENERATED := $(if $(wildcard $(PYTHON_BIN)),$(PYTHON_BIN),python3) $(DATADIR)/generated.py clean
+
 ifeq ($(OUTDIR),.)
 clean:
-	rm -f $(HTML) $(LATEX) $(PDF)
+	$(CLEAN_GENERATED) $(patsubst %/,%,$(dir $(CHUNKED))) $(MAILING) search
+	rm -f $(HTML) $(PREVIEW) $(DIFF) $(DIFF:.html=.json) $(LATEX) $(PDF) $(addsuffix .profile.json, $(HTML) $(PREVIEW) $(LATEX) $(PDF)) $(addsuffix .index.json, $(HTML) $(PREVIEW) $(LATEX) $(PDF)) $(HTML:=.gz) $(HTML:=.br)
 else
 clean:
+	$(CLEAN_GENERATED) $(MAILING)
 	rm -rf $(OUTDIR)
 
 $(OUTDIR):
 	mkdir -p $@
 
-.PHONY: $(HTML) $(LATEX) $(PDF)
-$(HTML) $(LATEX) $(PDF): %: $(OUTDIR)/%
+.PHONY: $(HTML) $(PREVIEW) $(DIFF) $(CHUNKED) $(LATEX) $(PDF)
+$(HTML) $(PREVIEW) $(DIFF) $(CHUNKED) $(LATEX) $(PDF): %: $(OUTDIR)/%
 endif
 
+# Before `%.html`, as make 3.81 picks the first pattern rule that matches.
+$(OUTDIR)/%.preview.html: %.md $(DEPS) | $(OUTDIR)
+	$(PANDOC)
+
+# The base revision isn't known to make, so it's always diffed again, but the
+# AST is only written if it changed, see `revdiff.py`. Both revisions are read
+# with the same defaults as `PANDOC` reads a paper with, up to the citations.
+$(addprefix $(OUTDIR)/, $(DIFF:.html=.json)): $(OUTDIR)/%.diff.json: %.md $(DEPS) $(DATADIR)/revdiff.py FORCE | $(OUTDIR)
+	$(PYTHON_BIN) $(DATADIR)/revdiff.py $@ $(or $(DIFF_BASE),-) $< pandoc $(DATADIR)/srefs.defs --data-dir=$(DATADIR) -M data-dir=$(DATADIR) -d base -d formatting $(and $(DEFAULTS),-d $(DEFAULTS)) -t json --template=/dev/null
+
+$(OUTDIR)/%.diff.html: $(OUTDIR)/%.diff.json %.md $(DEPS) | $(OUTDIR)
+	$(PANDOC)
+
+# `chunked.py` creates the directory itself, see `PANDOC`.
+$(OUTDIR)/%/index.html: %.md $(DEPS) $(DATADIR)/chunked.py $(DATADIR)/generated.py $(OUTDIR)/$(ASSETSDIR)/defaults.yaml
+	$(PANDOC)
+
 $(OUTDIR)/%.html: %.md $(DEPS) | $(OUTDIR)
 	$(PANDOC)
 
@@ -91,3 +270,27 @@ $(OUTDIR)/%.latex: %.md $(DEPS) | $(OUTDIR)
 
 $(OUTDIR)/%.pdf: %.md $(DEPS) | $(OUTDIR)
 	$(PANDOC)
+
+%.check: %.md $(DEPS) $(DATADIR)/check.py
+	$(CHECK)
+
+$(OUTDIR)/index.html: $(addprefix $(OUTDIR)/, $(HTML)) $(DATADIR)/mailing.py | $(PYTHON_DIR)
+	$(PYTHON_BIN) $(DATADIR)/mailing.py $(OUTDIR) '$(MAILING_TITLE)' $(SRC)
+
+# Only the papers whose index changed are indexed again, see `search.py`.
+$(OUTDIR)/search/manifest.json: $(addprefix $(OUTDIR)/, $(HTML)) $(DATADIR)/search.py $(DATADIR)/templates/search.html | $(PYTHON_DIR)
+	$(PYTHON_BIN) $(DATADIR)/search.py $(@D) $(addprefix $(OUTDIR)/, $(HTML:=.index.json))
+
+ifneq ($(INDEX),)
+# An HTML output that was built without INDEX is built again, for its index.
+$(filter-out $(patsubst %.index.json,%,$(wildcard $(OUTDIR)/*.html.index.json)), $(addprefix $(OUTDIR)/, $(HTML))): FORCE
+endif
+
+.PHONY: FORCE
+FORCE:
+
+$(OUTDIR)/%.html.gz: $(OUTDIR)/%.html $(DATADIR)/compress.py | $(PYTHON_DIR)
+	@$(PYTHON_BIN) $(DATADIR)/compress.py gzip $<
+
+$(OUTDIR)/%.html.br: $(OUTDIR)/%.html $(DATADIR)/compress.py | $(PYTHON_DIR)
+	@$(PYTHON_BIN) $(DATADIR)/compress.py brotli $<
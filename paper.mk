@@ -21,6 +21,20 @@
 #   make p2806r4.html   # builds p2806r4.html from p2806r4.md
 #   make                # also builds p2806r4.html from p2806r4.md
 #
+#   make p2806r4.preview.html
+#                       # builds a draft preview from p2806r4.md,
+#                       # see data/defaults/preview.yaml
+#   make p2806r4/index.html
+#                       # builds p2806r4/index.html and a page per section,
+#                       # see data/defaults/chunked.yaml
+#   make p2806r4.check  # validates p2806r4.md without rendering it,
+#                       # see data/check.py
+#   make p2806r4.diff.html
+#                       # builds the changes from the previous revision,
+#                       # p2806r3.md, see data/revdiff.py
+#   make lookup         # builds the completion index of stable names and
+#                       # citations for editors, see data/lookup.py
+#
 # You may also introduce explicit source-to-output mappings.
 #
 # In reflection/Makefile:
@@ -34,6 +48,10 @@
 #   make p2996r13.html  # builds p2996r13.html from reflection.md
 #   make                # also builds p2996r13.html from reflection.md
 #
+# A preview or a chunked build of a mapped target needs the same mapping:
+#
+#   p2996r13.html p2996r13.preview.html p2996r13/index.html p2996r13.check: reflection.md
+#
 # The following variables can be set before including this file:
 #
 #   - DEFAULTS := <path/to/defaults.yaml>
@@ -44,6 +62,60 @@
 #
 #     Passed to Python virtual env to install additional packages.
 #
+#   - CITATIONS := native
+#
+#     Render citations and references from the indexed reference store
+#     rather than running `citeproc` over all of `csl.json` (default: citeproc).
+#
+#   - PROFILE := 1
+#
+#     Instrument the `wg21.py` filter, and write a JSON report of where its time
+#     is spent next to each output, e.g. `p2806r4.html.profile.json`.
+#
+#   - INDEX := 1
+#
+#     Write a JSON index of the headings, the paragraph numbers, the notes and
+#     examples, the stable name references and the citations of each paper
+#     next to each output, e.g. `p2806r4.html.index.json`, for other tools to
+#     use rather than parsing the output. See `Index` in `data/filters/wg21.py`.
+#
+#   - TIMINGS := <path/to/timings.jsonl>
+#
+#     Append the time each build spends in each stage (Markdown parsing, each
+#     filter, the writer and the PDF engine) to the specified file.
+#     `make timings` ranks the papers and their stages from it.
+#
+#   - ASSETS := <path/to/assets>
+#
+#     Write the stylesheets and the icon once into the specified directory,
+#     relative to the HTML output, with content-hashed names, and link them
+#     from each paper rather than embedding them, e.g. `ASSETS := ../assets`
+#     to share them between the paper directories.
+#
+#   - MINIFY := 1
+#
+#     Minify the HTML output, keeping the whitespace in `pre` and `code`
+#     elements and all attributes. `make compress` then writes gzip and brotli
+#     siblings of each HTML output, e.g. `p2806r4.html.gz` and `p2806r4.html.br`.
+#
+#   - CHECK_FORMAT := json
+#
+#     Print the diagnostics of `make <paper>.check` as JSON lines rather than
+#     as `FILE:LINE:COLUMN: warning: MESSAGE` (default: text).
+#
+#   - RESOURCE_CACHE := <path/to/cache>
+#
+#     Cache the remote images that the papers reference in the specified
+#     directory, and embed them from there rather than fetching them on every
+#     build. They're revalidated once they expire, and used as they are when
+#     the network isn't available. Not used for the HTML output that isn't
+#     self-contained, i.e. with ASSETS, previews and chunked builds.
+#
+#   - RESOURCE_CACHE_SIZE := <MiB>
+#
+#     Remove the least recently used resources from RESOURCE_CACHE once it
+#     is over the specified size (default: 100).
+#
 # To set these variables at repo-level, create a top-level mk file with:
 #
 #   DEFAULTS := ...
@@ -61,6 +133,12 @@ include $(dir $(lastword $(MAKEFILE_LIST)))flat.mk
 %.html: $(DEPS)
 	$(PANDOC)
 
+%/index.html: $(DEPS) $(DATADIR)/chunked.py $(DATADIR)/generated.py $(OUTDIR)/$(ASSETSDIR)/defaults.yaml
+	$(PANDOC)
+
+%.check: $(DEPS) $(DATADIR)/check.py
+	$(CHECK)
+
 %.latex: $(DEPS)
 	$(PANDOC)
 
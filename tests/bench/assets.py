@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Compare the self-contained HTML output to the one with shared assets.
+
+Usage: assets.py OUTDIR [BANDWIDTH] [RTT]
+
+Builds the test cases in HTML into OUTDIR, once self-contained and once with
+`ASSETS := assets`, and reports for each mode:
+
+  - The build time, and the total size of the papers and the assets.
+  - The bytes transferred on the first load of a paper, which includes the
+    assets it links, and on a repeat load of another paper, when the assets
+    are cached. Sizes are also given gzip-compressed, as they are served.
+  - The load times estimated from the compressed sizes, with BANDWIDTH in
+    Mbit/s (default: 10) and RTT in milliseconds (default: 50). A load is one
+    round trip for the paper, and another for the assets, fetched in parallel.
+"""
+
+import gzip
+import os
+import os.path
+import re
+import subprocess
+import sys
+import time
+
+def build(outdir, *args):
+    start = time.perf_counter()
+    subprocess.run(['make', '-s', '-f', '../flat.mk', f'OUTDIR={outdir}', *args, 'html'],
+                   check=True)
+    return time.perf_counter() - start
+
+def size(path, compress=False):
+    with open(path, 'rb') as f:
+        content = f.read()
+    return len(gzip.compress(content) if compress else content)
+
+def main():
+    outdir = sys.argv[1]
+    bandwidth = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rtt = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.05
+
+    def load_time(nbytes, round_trips):
+        return round_trips * rtt + nbytes * 8 / (bandwidth * 1e6)
+
+    print(f'{"mode":14} {"build":>7} {"papers":>9} {"assets":>8} '
+          f'{"first load":>20} {"repeat load":>20}')
+    for mode, args in [('self-contained', []), ('assets', ['ASSETS=assets'])]:
+        directory = os.path.join(outdir, mode)
+        subprocess.run(['rm', '-rf', directory], check=True)
+        elapsed = build(directory, *args)
+
+        papers = sorted(
+            os.path.join(directory, name)
+            for name in os.listdir(directory) if name.endswith('.html'))
+        assets = {}
+        for paper in papers:
+            with open(paper, 'r') as f:
+                for href in re.findall(r'<link rel="(?:stylesheet|icon)" href="(?!data:)([^"]+)"', f.read()):
+                    assets[href] = os.path.join(directory, href)
+
+        total = sum(size(paper) for paper in papers)
+        shared = sum(size(path) for path in assets.values())
+        paper = sum(size(paper, True) for paper in papers) / len(papers)
+        linked = sum(size(path, True) for path in assets.values())
+
+        first = paper + linked
+        first_time = load_time(first, 2 if assets else 1)
+        repeat_time = load_time(paper, 1)
+        print(f'{mode:14} {elapsed:6.2f}s {total:9} {shared:8} '
+              f'{first:9.0f}B {first_time * 1000:7.0f}ms '
+              f'{paper:9.0f}B {repeat_time * 1000:7.0f}ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Compare the single-page HTML output of a large paper to the chunked one.
+
+Usage: chunked.py DATADIR OUTDIR [SCALE] [BANDWIDTH] [RTT]
+
+Generates a synthetic paper with SCALE sections (default: 100) with `paper.py`
+into OUTDIR, and builds it into a single page and into one page per section,
+both with `ASSETS := assets`. Reports for each mode:
+
+  - The build time, and the number and total size of the pages.
+  - The size of the first page, which is what the browser needs before it can
+    render anything, and of the largest page. Sizes are given gzip-compressed,
+    as they are served.
+  - The time to first render estimated from the first page and the assets,
+    with BANDWIDTH in Mbit/s (default: 10) and RTT in milliseconds
+    (default: 50). A load is one round trip for the page, and another for the
+    assets, fetched in parallel.
+"""
+
+import gzip
+import os
+import os.path
+import subprocess
+import sys
+import time
+
+import paper
+
+ROOTDIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def build(outdir, target):
+    start = time.perf_counter()
+    subprocess.run(['make', '-s', '-f', os.path.join(ROOTDIR, 'flat.mk'),
+                    'OUTDIR=generated', 'ASSETS=assets', target],
+                   cwd=outdir, check=True)
+    return time.perf_counter() - start
+
+def size(path, compress=False):
+    with open(path, 'rb') as f:
+        content = f.read()
+    return len(gzip.compress(content) if compress else content)
+
+def main():
+    datadir, outdir = sys.argv[1:3]
+    scale = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    bandwidth = float(sys.argv[4]) if len(sys.argv) > 4 else 10
+    rtt = float(sys.argv[5]) / 1000 if len(sys.argv) > 5 else 0.05
+
+    subprocess.run(['rm', '-rf', outdir], check=True)
+    os.makedirs(outdir)
+    with open(os.path.join(outdir, 'paper.md'), 'w') as f:
+        f.write(paper.generate(datadir, scale))
+
+    generated = os.path.join(outdir, 'generated')
+    # Built first, so that the assets aren't counted in either build time.
+    build(outdir, os.path.join('generated', 'assets', 'defaults.yaml'))
+    assets = os.path.join(generated, 'assets')
+    linked = sum(size(os.path.join(assets, name), True)
+                 for name in os.listdir(assets) if name != 'defaults.yaml')
+
+    print(f'{"mode":8} {"build":>7} {"pages":>6} {"total":>9} '
+          f'{"first page":>11} {"largest":>9} {"first render":>13}')
+    for mode, target, first in [
+            ('single', 'paper.html', 'paper.html'),
+            ('chunked', 'paper/index.html', os.path.join('paper', 'index.html'))]:
+        elapsed = build(outdir, target)
+        if mode == 'single':
+            pages = [os.path.join(generated, 'paper.html')]
+        else:
+            directory = os.path.join(generated, 'paper')
+            pages = sorted(
+                os.path.join(directory, name)
+                for name in os.listdir(directory) if name.endswith('.html'))
+
+        total = sum(size(page) for page in pages)
+        compressed = size(os.path.join(generated, first), True)
+        largest = max(size(page, True) for page in pages)
+        render = 2 * rtt + (compressed + linked) * 8 / (bandwidth * 1e6)
+        print(f'{mode:8} {elapsed:6.2f}s {len(pages):6} {total:9} '
+              f'{compressed:10}B {largest:8}B {render * 1000:11.0f}ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Measure the load/dump throughput of the Pandoc AST codecs in `wg21.py`.
+
+Usage: codec.py DATADIR [SCALE] [REPEAT]
+
+The AST is built by concatenating the test papers SCALE times and parsing
+the result with `pandoc`. Each codec is timed REPEAT times, and the best
+time is reported.
+"""
+
+import gc
+import glob
+import importlib.util
+import os.path
+import sys
+import time
+
+import panflute as pf
+import yaml
+
+def best_of(repeat, f):
+    best = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        start = time.perf_counter()
+        result = f()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    datadir = sys.argv[1]
+    scale = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    spec = importlib.util.spec_from_file_location(
+        'wg21', os.path.join(datadir, 'filters', 'wg21.py'))
+    wg21 = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(wg21)
+
+    with open(os.path.join(datadir, 'defaults', 'base.yaml'), 'r') as f:
+        input_format = yaml.safe_load(f)['from']
+
+    papers = []
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', '*.md'))):
+        with open(path, 'r') as f:
+            papers.append(f.read())
+
+    data = pf.run_pandoc(
+        '\n\n'.join(papers * scale),
+        ['--from', input_format, '--to', 'json']).encode('utf-8')
+    mb = len(data) / 1e6
+
+    codecs = [wg21.JSONCodec]
+    if importlib.util.find_spec('orjson') is not None:
+        codecs.append(wg21.ORJSONCodec)
+
+    print(f'AST: {mb:.1f} MB (scale: {scale}, best of {repeat})')
+    print(f'{"codec":8} {"load":>16} {"dump":>16}')
+    for codec in codecs:
+        load, doc = best_of(repeat, lambda: codec.loads(data))
+        dump, out = best_of(repeat, lambda: codec.dumps(doc))
+        assert out == wg21.JSONCodec.dumps(doc), f'{codec.name}: output mismatch'
+        print(f'{codec.name:8} {load:6.3f}s {mb / load:5.1f} MB/s {dump:6.3f}s {mb / dump:5.1f} MB/s')
+
+if __name__ == '__main__':
+    main()
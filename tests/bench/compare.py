@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Compare two results files written by `pipeline.py`.
+
+Usage: compare.py BASELINE RESULTS
+"""
+
+import json
+import sys
+
+def main():
+    with open(sys.argv[1], 'r') as f:
+        baseline = json.load(f)
+    with open(sys.argv[2], 'r') as f:
+        results = json.load(f)
+
+    for key in ['pandoc', 'python', 'citations']:
+        if baseline.get(key) != results.get(key):
+            print(f'note: {key} differs: {baseline.get(key)} -> {results.get(key)}')
+
+    print(f'{"scale":>5} {"stage":16} {"wall (s)":>22} {"subprocesses":>14} {"peak RSS (MiB)":>16}')
+    for scale, stages in results['scales'].items():
+        for name, new in stages.items():
+            old = baseline['scales'].get(scale, {}).get(name)
+            if old is None:
+                continue
+            change = (new['wall'] - old['wall']) / old['wall'] * 100 if old['wall'] else 0
+            print(f'{scale:>5} {name:16} '
+                  f'{old["wall"]:7.3f} -> {new["wall"]:7.3f} {change:+4.0f}% '
+                  f'{old["subprocesses"]:5} -> {new["subprocesses"]:4} '
+                  f'{old["rss"]:6} -> {new["rss"]:5}')
+
+if __name__ == '__main__':
+    main()
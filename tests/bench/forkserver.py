@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Compare the builds with the fork server of `wg21.py` to the builds without.
+
+Usage: forkserver.py DATADIR OUTDIR [PAPERS] [SCALE] [JOBS]
+
+Generates PAPERS (default: 20) synthetic papers with SCALE sections (default:
+1) with `paper.py` into OUTDIR, and builds them with `make -j JOBS html`, JOBS
+being the number of cores by default, without and with `FORKSERVER=1`, once
+the server is started. Reports the time of each per build, and checks that
+they built the same output.
+"""
+
+import filecmp
+import os
+import os.path
+import subprocess
+import sys
+import time
+
+import paper
+
+ROOTDIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def build(outdir, name, *args):
+    start = time.perf_counter()
+    subprocess.run(['make', '-s', '-f', os.path.join(ROOTDIR, 'flat.mk'), f'OUTDIR={name}', *args],
+                   cwd=outdir, check=True)
+    return time.perf_counter() - start
+
+def main():
+    datadir, outdir = sys.argv[1:3]
+    papers = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    scale = int(sys.argv[4]) if len(sys.argv) > 4 else 1
+    jobs = int(sys.argv[5]) if len(sys.argv) > 5 else os.cpu_count()
+
+    forkserver = [sys.executable, os.path.join(datadir, 'filters', 'forkserver.py')]
+    script = os.path.abspath(os.path.join(datadir, 'filters', 'wg21.py'))
+
+    subprocess.run(['rm', '-rf', outdir], check=True)
+    os.makedirs(outdir)
+    text = paper.generate(datadir, scale)
+    for i in range(papers):
+        number = f'P{1000 + i}R0'
+        with open(os.path.join(outdir, f'{number.lower()}.md'), 'w') as f:
+            f.write(text.replace('P0000R0', number, 1))
+
+    # The first build with `FORKSERVER=1` starts the server in the background.
+    subprocess.run([*forkserver, 'stop', script], check=True)
+    build(outdir, 'warmup', 'FORKSERVER=1', 'p1000r0.html')
+    for _ in range(50):
+        if subprocess.run([*forkserver, 'status', script], capture_output=True).returncode == 0:
+            break
+        time.sleep(0.1)
+    else:
+        sys.exit('forkserver: the server did not start')
+
+    print(f'{papers} papers, scale {scale}, {jobs} jobs')
+    try:
+        results = {}
+        for name, mode in (('plain', 'FORKSERVER='), ('forked', 'FORKSERVER=1')):
+            results[name] = build(outdir, name, mode, f'-j{jobs}', 'html')
+            print(f'{mode:13} {results[name]:7.2f}s {results[name] / papers * 1000:7.0f}ms/build')
+    finally:
+        subprocess.run([*forkserver, 'stop', script], check=True)
+
+    saved = (results['plain'] - results['forked']) / papers * 1000
+    print(f'saved {saved:.0f}ms/build')
+
+    plain, forked = os.path.join(outdir, 'plain'), os.path.join(outdir, 'forked')
+    _, mismatch, errors = filecmp.cmpfiles(plain, forked, os.listdir(plain), shallow=False)
+    if mismatch or errors:
+        sys.exit(f'forkserver: the builds differ in {", ".join(mismatch + errors)}')
+
+if __name__ == '__main__':
+    main()
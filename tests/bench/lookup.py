@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Benchmark the completion and lookup index of `data/lookup.py`.
+
+Usage: lookup.py DATADIR OUTDIR [SREFS] [CITES]
+
+Generates `srefs.json` and `csl.json` with SREFS (default: 6000) stable names
+and CITES (default: 80000) citation ids, about the sizes of the real ones,
+into OUTDIR, and builds the index from them. Reports the build time and the
+size of the index, the time for a new `lookup.py` process to answer its first
+query, and the latency of queries against an open index, as for `serve`.
+"""
+
+import json
+import os
+import os.path
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+WORDS = '''
+reflection contracts pattern matching executors senders receivers ranges
+coroutines modules concepts constexpr allocator iterator lifetime template
+deduction expansion statements pack indexing hazard pointers linear algebra
+'''.split()
+
+def generate(outdir, nsrefs, ncites):
+    rng = random.Random(0)
+    srefs = {}
+    for i in range(nsrefs):
+        name = '.'.join(rng.sample(WORDS, rng.randint(1, 3))) + f'.{i}'
+        srefs[name] = [f'{i // 100}.{i % 100}', ' '.join(rng.sample(WORDS, 3)).title()]
+
+    items = []
+    for i in range(ncites):
+        number = 1000 + i // 8
+        items.append({
+            'id': f'P{number}R{i % 8}',
+            'title': ' '.join(rng.sample(WORDS, 4)).capitalize(),
+            'author': [{'family': f'Author {rng.randint(0, 2000)}'}],
+            'issued': {'date-parts': [[2000 + i % 26, 1 + i % 12, 1 + i % 28]]},
+            'URL': f'https://wg21.link/p{number}r{i % 8}',
+        })
+
+    with open(os.path.join(outdir, 'srefs.json'), 'w') as f:
+        json.dump(srefs, f)
+    with open(os.path.join(outdir, 'csl.json'), 'w') as f:
+        json.dump(items, f)
+
+def main():
+    datadir, outdir = sys.argv[1:3]
+    nsrefs = int(sys.argv[3]) if len(sys.argv) > 3 else 6000
+    ncites = int(sys.argv[4]) if len(sys.argv) > 4 else 80000
+
+    os.makedirs(outdir, exist_ok=True)
+    generate(outdir, nsrefs, ncites)
+
+    script = os.path.join(datadir, 'lookup.py')
+    db = os.path.join(outdir, 'lookup.db')
+    if os.path.exists(db):
+        os.remove(db)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, script, 'build', outdir, db], check=True)
+    print(f'build: {time.perf_counter() - start:.2f}s, {os.path.getsize(db) // 1024} KiB')
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, script, 'complete', db, '@P1234'],
+                   stdout=subprocess.DEVNULL, check=True)
+    print(f'first query of a new process: {(time.perf_counter() - start) * 1000:.0f}ms')
+
+    sys.path.insert(0, datadir)
+    import lookup
+    index = lookup.Index(db)
+    queries = {
+        'prefix (1 char)': lambda: index.complete('p'),
+        'prefix (stable name)': lambda: index.complete('[reflection'),
+        'prefix (paper)': lambda: index.complete('@P123'),
+        'substring (title)': lambda: index.complete('hazard poi'),
+        'substring (author)': lambda: index.complete('author 1999'),
+        'hover': lambda: index.hover('P1234R5'),
+    }
+    for name, query in queries.items():
+        times = []
+        for _ in range(20):
+            start = time.perf_counter()
+            results = query()
+            times.append(time.perf_counter() - start)
+        print(f'{name:22} {statistics.median(times) * 1000:7.2f}ms median '
+              f'{max(times) * 1000:7.2f}ms max, {len(results)} results')
+
+if __name__ == '__main__':
+    main()
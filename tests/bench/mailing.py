@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Compare the throughput of `make mailing` to building the papers with `make -j`.
+
+Usage: mailing.py DATADIR OUTDIR [PAPERS] [SCALE] [JOBS]
+
+Generates PAPERS (default: 50) synthetic papers with SCALE sections (default:
+2) with `paper.py` into OUTDIR, and builds them with `make -j JOBS html` and
+with `make mailing MAILING_JOBS=JOBS`, JOBS being the number of cores by
+default. Reports the time of each in papers per minute.
+
+The shared work that `make mailing` saves grows with `csl.json`, so the
+difference is only representative with the databases of `make update`.
+"""
+
+import os
+import os.path
+import subprocess
+import sys
+import time
+
+import paper
+
+ROOTDIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def build(outdir, *args):
+    start = time.perf_counter()
+    subprocess.run(['make', '-s', '-f', os.path.join(ROOTDIR, 'flat.mk'), *args],
+                   cwd=outdir, check=True)
+    return time.perf_counter() - start
+
+def main():
+    datadir, outdir = sys.argv[1:3]
+    papers = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    scale = int(sys.argv[4]) if len(sys.argv) > 4 else 2
+    jobs = int(sys.argv[5]) if len(sys.argv) > 5 else os.cpu_count()
+
+    subprocess.run(['rm', '-rf', outdir], check=True)
+    os.makedirs(outdir)
+    text = paper.generate(datadir, scale)
+    for i in range(papers):
+        number = f'P{1000 + i}R0'
+        with open(os.path.join(outdir, f'{number.lower()}.md'), 'w') as f:
+            f.write(text.replace('P0000R0', number, 1))
+
+    print(f'{papers} papers, scale {scale}, {jobs} jobs')
+    for mode, args in [
+            ('make -j', ['OUTDIR=generated', f'-j{jobs}', 'html']),
+            ('make mailing', ['OUTDIR=generated', f'MAILING_JOBS={jobs}', 'mailing'])]:
+        elapsed = build(outdir, *args)
+        print(f'{mode:13} {elapsed:7.2f}s {papers / elapsed * 60:7.1f} papers/min')
+
+if __name__ == '__main__':
+    main()
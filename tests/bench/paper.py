@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Generate a synthetic paper for benchmarking.
+
+Usage: paper.py DATADIR SCALE
+
+The paper consists of SCALE sections, each of which exercises the expensive
+parts of `wg21.py`: code blocks with embedded Markdown, deep `wording` divs with
+automatic paragraph numbers, a large `cmptable`, stable name references,
+citations and `{.sub}` substitutions. The output is deterministic for a given
+SCALE and set of `srefs.json` and `csl.db` entries.
+"""
+
+import json
+import os.path
+import sqlite3
+import sys
+
+CODE_BLOCKS = 20
+CMPTABLE_ROWS = 8
+WORDING_DEPTH = 4
+SREFS = 5
+CITATIONS = 5
+
+def code_block(i):
+    return f'''```cpp
+template <@[class](typename){{.sub}}@ T{i}@[, class U]{{.add}}@>
+@[constexpr]{{.rm}}@ auto $func-{i}$(T{i}&& t) -> @[`$see-below$`]{{.add}}@ {{
+  return @[std::move(t)](std::forward<T{i}>(t)){{.sub}}@;  // _Effects_: @[equivalent]{{.add}}@
+}}
+```
+'''
+
+def wording_item(depth, i):
+    indent = '   ' * (WORDING_DEPTH - depth)
+    text = (f'{indent}#. The _entity_ `e{i}` is [potentially](possibly){{.sub}} '
+            f'evaluated unless it is an [unevaluated]{{.add}} operand.')
+    if depth == 1:
+        return text
+    return '\n\n'.join([text, wording_item(depth - 1, i), wording_item(depth - 1, i + 1)])
+
+def cmptable(i):
+    rows = '\n\n'.join(f'''### Before
+```cpp
+auto r{row} = std::ranges::transform(v, [](int x) {{ return x * {row}; }});
+```
+
+### After
+```cpp
+auto r{row} = v | std::views::transform([](int x) {{ return x * {row}; }});
+```''' for row in range(CMPTABLE_ROWS))
+    return f'''::: cmptable
+
+> Comparison {i}
+
+{rows}
+
+:::
+'''
+
+def section(i, srefs, citations):
+    pick = lambda keys, n: [keys[(i * n + k) % len(keys)] for k in range(n)]
+    sref_text = ', '.join(f'[{name}]{{.sref}}' for name in pick(srefs, SREFS))
+    cite_text = ', '.join(
+        f'[@{id}]{{.title}}' if k % 2 else f'[@{id}]'
+        for k, id in enumerate(pick(citations, CITATIONS)))
+    return '\n'.join([
+        f'# Section {i}',
+        '',
+        f'See {sref_text}, as well as {cite_text}.',
+        '',
+        '::: wording',
+        wording_item(WORDING_DEPTH, i),
+        '',
+        *(f'[{"#" if k % 3 == 0 else "#.#"}]{{.pnum}} Paragraph {k} of section {i}.\n'
+          for k in range(6)),
+        ':::',
+        '',
+        *(code_block(i * CODE_BLOCKS + k) for k in range(CODE_BLOCKS)),
+        cmptable(i),
+    ])
+
+def generate(datadir, scale):
+    with open(os.path.join(datadir, 'srefs.json'), 'r') as f:
+        srefs = sorted(json.load(f))
+
+    db = sqlite3.connect(f'file:{os.path.join(datadir, "csl.db")}?mode=ro', uri=True)
+    citations = [id for id, in db.execute('SELECT id FROM refs ORDER BY id LIMIT 1000')]
+    db.close()
+
+    header = f'''---
+title: "Synthetic Paper (scale: {scale})"
+document: P0000R0
+date: 2026-01-01
+audience: WG21
+author:
+  - name: Test Author
+toc: true
+---
+'''
+    return '\n'.join([header, *(section(i, srefs, citations) for i in range(scale))])
+
+if __name__ == '__main__':
+    sys.stdout.write(generate(sys.argv[1], int(sys.argv[2])))
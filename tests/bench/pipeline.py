@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Benchmark the build of synthetic papers, stage by stage.
+
+Usage: pipeline.py DATADIR CITATIONS OUTDIR RESULTS SCALE...
+
+For each SCALE, generates a paper with `paper.py` into OUTDIR, and runs the
+same pipeline as the `PANDOC` macro in `base.mk` one stage at a time, passing
+the AST from one stage to the next as JSON:
+
+  - `read`: Parse the Markdown.
+  - One stage per filter in `citations-CITATIONS.yaml`. Lua filters and
+    `citeproc` run in a `pandoc` that reads and writes JSON, Python filters
+    run directly.
+  - `write`: Render the HTML.
+  - `total`: The whole pipeline in a single `pandoc` invocation.
+
+The wall time, the number of subprocesses and the peak RSS of each stage are
+written to RESULTS as JSON, which `compare.py` can compare between runs. The
+subprocesses are counted by putting wrappers for `pandoc` and `python3` in
+front of `PATH`. The peak RSS is the largest of any process in the stage.
+"""
+
+import json
+import os
+import os.path
+import platform
+import shutil
+import subprocess
+import sys
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(__file__))
+import paper
+
+def make_wrappers(outdir):
+    """Creates the wrappers that log `pandoc` and `python3` invocations."""
+    bindir = os.path.join(outdir, 'bin')
+    os.makedirs(bindir, exist_ok=True)
+    for name in ['pandoc', 'python3']:
+        path = os.path.join(bindir, name)
+        with open(path, 'w') as f:
+            f.write(f'#!/bin/sh\n'
+                    f'echo {name} >> "$WG21_BENCH_LOG"\n'
+                    f'exec {shutil.which(name)} "$@"\n')
+        os.chmod(path, 0o755)
+    return bindir
+
+def run(args, bindir, stdin=None, stdout=None):
+    """Runs a stage, and returns its wall time, subprocess count and peak RSS."""
+    log = os.path.join(os.path.dirname(bindir), 'invocations.log')
+    open(log, 'w').close()
+    env = dict(os.environ,
+               PATH=os.pathsep.join([bindir, os.environ['PATH']]),
+               WG21_BENCH_LOG=log)
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(args, env=env, stdin=stdin, stdout=stdout)
+    _, status, rusage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, args)
+
+    # The stage itself is also started through a wrapper.
+    with open(log, 'r') as f:
+        subprocesses = len(f.read().splitlines()) - 1
+
+    return {
+        'wall': round(wall, 3),
+        'subprocesses': subprocesses,
+        'rss': rusage.ru_maxrss // 1024,  # MiB
+    }
+
+def bench(datadir, citations, outdir, scale, bindir):
+    path = os.path.join(outdir, f'paper-{scale}.md')
+    with open(path, 'w') as f:
+        f.write(paper.generate(datadir, scale))
+
+    with open(os.path.join(datadir, 'defaults', f'citations-{citations}.yaml'), 'r') as f:
+        defaults = yaml.safe_load(f)
+
+    pandoc = [os.path.join(bindir, 'pandoc'), f'--data-dir={datadir}']
+    common = ['-M', f'data-dir={datadir}', '-d', 'base', '-d', 'formatting']
+    # `--from` and `--template` need to come after `-d base` to override it.
+    # The JSON writer doesn't use a template, but the one set by `base.yaml`
+    # still needs to exist, so it's overridden for the intermediate stages.
+    to_json = ['--template=/dev/null', '--to', 'json']
+
+    stages = {}
+    ast = os.path.join(outdir, f'paper-{scale}.read.json')
+    stages['read'] = run(
+        [*pandoc, os.path.join(datadir, 'srefs.defs'), path, *common, *to_json, '-o', ast],
+        bindir)
+
+    for i, name in enumerate(defaults['filters']):
+        out = os.path.join(outdir, f'paper-{scale}.{i}.{name}.json')
+        if name.endswith('.py'):
+            with open(ast, 'r') as stdin, open(out, 'w') as stdout:
+                stages[name] = run(
+                    [os.path.join(bindir, 'python3'), os.path.join(datadir, 'filters', name), 'html'],
+                    bindir, stdin=stdin, stdout=stdout)
+        else:
+            flag = '--citeproc' if name == 'citeproc' else f'--lua-filter={name}'
+            stages[name] = run(
+                [*pandoc, ast, *common, '--from', 'json', *to_json, flag, '-o', out],
+                bindir)
+        ast = out
+
+    html = os.path.join(outdir, f'paper-{scale}.html')
+    stages['write'] = run([*pandoc, ast, *common, '--from', 'json', '-o', html], bindir)
+
+    stages['total'] = run(
+        [*pandoc, os.path.join(datadir, 'srefs.defs'), path, *common,
+         '-d', f'citations-{citations}', '-o', html],
+        bindir)
+
+    return stages
+
+def main():
+    datadir, citations, outdir, results, *scales = sys.argv[1:]
+
+    os.makedirs(outdir, exist_ok=True)
+    bindir = make_wrappers(outdir)
+
+    report = {
+        'pandoc': subprocess.run(['pandoc', '--version'], capture_output=True, text=True, check=True)
+                      .stdout.splitlines()[0],
+        'python': platform.python_version(),
+        'citations': citations,
+        'scales': {},
+    }
+    for scale in scales:
+        stages = bench(datadir, citations, outdir, int(scale), bindir)
+        report['scales'][scale] = stages
+        for name, stage in stages.items():
+            print(f'scale {scale:>4} {name:16} {stage["wall"]:8.3f}s '
+                  f'{stage["subprocesses"]:4} subprocesses {stage["rss"]:6} MiB')
+
+    with open(results, 'w') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+
+if __name__ == '__main__':
+    main()
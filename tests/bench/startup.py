@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Check the cold-start time of `wg21.py` against a budget.
+
+Usage: startup.py DATADIR BUDGET [REPEAT]
+
+Runs `wg21.py` on the AST of an empty paper REPEAT times, and fails if the
+best wall time, in milliseconds, is over BUDGET. With nothing to process,
+this is the interpreter startup, the imports, `prepare` and `finalize`.
+"""
+
+import os.path
+import subprocess
+import sys
+import time
+
+import panflute as pf
+
+paper = '''---
+title: Empty Paper
+document: P0000R0
+date: 2026-01-01
+audience: WG21
+author:
+  - name: Test Author
+---
+'''
+
+def main():
+    datadir = sys.argv[1]
+    budget = float(sys.argv[2])
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    # The JSON writer doesn't use a template, but the one set by `base.yaml`
+    # still needs to exist, so it's overridden here.
+    ast = pf.run_pandoc(paper, [
+        f'--data-dir={datadir}', '-M', f'data-dir={datadir}',
+        '-d', 'base', '-d', 'formatting', '--template=/dev/null', '--to', 'json'])
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, os.path.join(datadir, 'filters', 'wg21.py'), 'html'],
+            input=ast.encode('utf-8'), stdout=subprocess.DEVNULL, check=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f'wg21.py cold start: {best:.0f}ms (budget: {budget:.0f}ms)')
+    if best > budget:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
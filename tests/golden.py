@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Render the test cases in parallel and compare them to the expected output.
+
+Usage: golden.py [-j JOBS] EXPECTED ACTUAL [CHANGED...]
+
+Each test case is rendered into ACTUAL through `flat.mk` by one of JOBS
+workers, which defaults to the number of cores. Each output is compared to the
+one in EXPECTED as soon as it is rendered, and reported with its time and, if
+it differs, its diff. Expected outputs that no test case renders are reported
+as well.
+
+The renders share a fork server for `wg21.py` (see `FORKSERVER` in `flat.mk`),
+so that the filter of each one is forked with its imports already done rather
+than started in a fresh interpreter. One that the first render starts exits
+once it's been idle for `FORKSERVER_IDLE` seconds.
+
+If CHANGED paths are given, only the outputs affected by a change to them are
+rendered, the others in ACTUAL are left as they are. A test case is affected
+by a change to itself or its expected output. Changes to the data files affect
+every output, except for the ones in `AFFECTS` below which only affect some.
+"""
+
+import argparse
+import concurrent.futures
+import difflib
+import fnmatch
+import glob
+import os
+import os.path
+import re
+import subprocess
+import sys
+import time
+
+ROOTDIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATADIR = os.path.join(ROOTDIR, 'data')
+
+FORMATS = ['html', 'latex']
+
+FORKSERVER_IDLE = 30
+
+# Over-approximates the test cases with citations, e.g. `[@N4861]`.
+CITES = re.compile(r'(?<![\w}@])@\w').search
+
+# Data files that only affect some of the outputs, as a predicate of the
+# format and the Markdown source of a test case.
+AFFECTS = {
+    'templates/wg21.html': lambda fmt, md: fmt == 'html',
+    'templates/*.css': lambda fmt, md: fmt == 'html',
+    'syntax/highlighting-css.yaml': lambda fmt, md: fmt == 'html',
+    'favicon.ico': lambda fmt, md: fmt == 'html',
+    'toc-depth.py': lambda fmt, md: fmt == 'html',
+    # Only used by the chunked HTML output, which isn't tested here.
+    'templates/wg21.chunkedhtml': lambda fmt, md: False,
+    'defaults/chunked.yaml': lambda fmt, md: False,
+    'chunked.py': lambda fmt, md: False,
+    # Only used by `make <paper>.check`, which is tested in `check/`.
+    'defaults/check.yaml': lambda fmt, md: False,
+    'check.py': lambda fmt, md: False,
+    'templates/wg21.latex': lambda fmt, md: fmt == 'latex',
+    'syntax/highlighting-macros.yaml': lambda fmt, md: fmt == 'latex',
+    'csl/*': lambda fmt, md: CITES(md),
+    'csl.json': lambda fmt, md: CITES(md),
+    'csl.db': lambda fmt, md: CITES(md),
+    'filters/citetitle.lua': lambda fmt, md: CITES(md),
+}
+
+def affected(output, changed):
+    """Returns whether `output`, e.g. `heading.html`, is affected by `changed`."""
+    name, fmt = os.path.splitext(output)
+    fmt = fmt[1:]
+    for path in changed:
+        path = os.path.abspath(path)
+        if os.path.basename(path) in [f'{name}.md', output]:
+            return True
+        if not path.startswith(DATADIR + os.sep):
+            if path.startswith(ROOTDIR + os.sep) and path.endswith('.md'):
+                continue  # Another test case, or documentation.
+            return True  # E.g., `base.mk`.
+        relpath = os.path.relpath(path, DATADIR)
+        predicate = next(
+            (p for pattern, p in AFFECTS.items() if fnmatch.fnmatch(relpath, pattern)), None)
+        if predicate is None:
+            return True
+        with open(f'{name}.md', 'r') as f:
+            if predicate(fmt, f.read()):
+                return True
+    return False
+
+def render(actual, output):
+    # The output may be up to date with its dependencies, but not the test.
+    path = os.path.join(actual, output)
+    if os.path.exists(path):
+        os.remove(path)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        ['make', '-s', '--no-print-directory', '-f', os.path.join(ROOTDIR, 'flat.mk'),
+         f'OUTDIR={actual}', 'FORKSERVER=1', path],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        env={'WG21_FORKSERVER_IDLE': str(FORKSERVER_IDLE), **os.environ})
+    return proc, time.perf_counter() - start
+
+def compare(expected, actual, output):
+    """Returns the diff between the expected and the actual `output`."""
+    def read(path):
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r') as f:
+            return f.readlines()
+    old, new = os.path.join(expected, output), os.path.join(actual, output)
+    return ''.join(difflib.unified_diff(read(old), read(new), old, new))
+
+def main():
+    parser = argparse.ArgumentParser(usage=__doc__.strip().splitlines()[2][len('Usage: '):])
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count())
+    parser.add_argument('expected')
+    parser.add_argument('actual')
+    parser.add_argument('changed', nargs='*')
+    args = parser.parse_args()
+
+    cases = sorted(os.path.splitext(md)[0] for md in glob.glob('*.md'))
+    outputs = [f'{name}.{fmt}' for name in cases for fmt in FORMATS]
+    # Expected outputs without a test case would otherwise never be compared.
+    stale = sorted(set(os.listdir(args.expected)) - set(outputs))
+    if args.changed:
+        outputs = [output for output in outputs if affected(output, args.changed)]
+        print(f'Rendering {len(outputs)} outputs affected by {" ".join(args.changed)}')
+
+    os.makedirs(args.actual, exist_ok=True)
+    failed = []
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(render, args.actual, output): output for output in outputs}
+        for future in concurrent.futures.as_completed(futures):
+            output = futures[future]
+            proc, elapsed = future.result()
+            diff = proc.stdout if proc.returncode != 0 else compare(args.expected, args.actual, output)
+            status = '\033[31mFAIL\033[0m' if diff else '\033[32m  ok\033[0m'
+            print(f'{status} {output:32} {elapsed:6.2f}s', flush=True)
+            if diff:
+                failed.append(output)
+                sys.stdout.write(diff)
+    for output in stale:
+        failed.append(output)
+        print(f'\033[31mFAIL\033[0m {output:32} expected output without a test case')
+
+    print(f'{len(outputs) + len(stale) - len(failed)} passed, {len(failed)} failed '
+          f'in {time.perf_counter() - start:.2f}s with {args.jobs} jobs')
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Check that `fragments.lua` finds the same fragments as `wg21.py`.
+
+Usage: fragments.py DATADIR
+
+`fragments.lua` finds the embedded Markdown of code elements, and decodes the
+new text of substitutions, as `CodeElems._replace_fragments_with_placeholders`
+and `process_subs` do. Both are run on the code elements and substitutions of
+the test papers and of the fragments within them, at every depth, with the
+delimiters that `embed_md_init` gives them, along with the cases below that
+the papers don't have. Fails if any of the fragments or decoded texts differs.
+"""
+
+import glob
+import html
+import importlib.util
+import io
+import json
+import os.path
+import subprocess
+import sys
+import urllib.parse
+
+import panflute as pf
+import yaml
+
+# The code texts and URLs that the test papers don't have.
+CODE = [
+    ('a @b', '@', '$'),
+    ('@a@@b@', '@', '$'),
+    ('a @b\nc@ d', '@', '$'),
+    ('@@@x@@ y@', '@', '$'),
+    ('$$x$ and $y', '@', '$'),
+    ('%%x%% and ##y##', '%', '#'),
+    ('f<T>@~opt~@()', '@', None),
+    ('f<T>$~opt~$()', None, '$'),
+]
+URLS = [
+    'plain',
+    'a%20b%2Fc',
+    '%E2%80%9Cquoted%E2%80%9D',
+    '%ZZ%2',
+    '%FF',
+    '&amp;',
+    'x%26lt;',
+]
+
+def main():
+    datadir = sys.argv[1]
+
+    spec = importlib.util.spec_from_file_location(
+        'wg21', os.path.join(datadir, 'filters', 'wg21.py'))
+    wg21 = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(wg21)
+
+    with open(os.path.join(datadir, 'defaults', 'base.yaml'), 'r') as f:
+        input_format = yaml.safe_load(f)['from']
+    with open(os.path.join(datadir, 'highlight-languages.txt'), 'r') as f:
+        wg21.highlight_languages.update(f.read().splitlines())
+
+    def split(text, md, em):
+        wg21.CodeElems.fragments, wg21.CodeElems.fragment_idx = [], {}
+        wg21.CodeElems.placeholder_prefix = ''
+        wg21.CodeElems._replace_fragments_with_placeholders(text, md, em)
+        return wg21.CodeElems.fragments
+
+    code, urls = list(CODE), list(URLS)
+    def collect(elem, doc):
+        if isinstance(elem, (pf.Code, pf.CodeBlock)) and (
+                'md' in elem.attributes or 'em' in elem.attributes):
+            code.append((elem.text, elem.attributes.get('md'), elem.attributes.get('em')))
+        elif isinstance(elem, pf.Link) and 'sub' in elem.classes:
+            urls.append(elem.url)
+
+    # The papers, then the fragments found in them, as `convert_fragments`
+    # reads them, until there are no more.
+    texts = []
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', '*.md'))):
+        with open(path, 'r') as f:
+            texts.append((f.read(), input_format))
+    seen = set()
+    while texts:
+        start = len(code), len(urls)
+        for text, from_ in texts:
+            doc = pf.load(io.StringIO(pf.run_pandoc(text, [
+                '--from', from_, '--to', 'json',
+                f'--metadata-file={os.path.join(datadir, "metadata.yaml")}'])))
+            for f in (wg21.code_init, wg21.embed_md_init, collect):
+                doc = doc.walk(f, doc)
+        found = [fragment for case in code[start[0]:] for fragment in split(*case)]
+        found += [html.unescape(urllib.parse.unquote(url)) for url in urls[start[1]:]]
+        found = [fragment for fragment in dict.fromkeys(found) if fragment not in seen]
+        seen.update(found)
+        texts = [('\n'.join(f'- []{{}}{fragment}' for fragment in found),
+                  f'{input_format}-raw_html-smart')] if found else []
+
+    result = json.loads(subprocess.run(
+        ['pandoc', 'lua', os.path.join(os.path.dirname(__file__), 'split.lua'),
+         os.path.join(datadir, 'filters', 'fragments.lua')],
+        input=json.dumps({'code': code, 'urls': urls}), text=True,
+        stdout=subprocess.PIPE, check=True).stdout)
+
+    # `split` finds each fragment as often as it occurs, `CodeElems` stores it once.
+    failed = False
+    for case, fragments in zip(code, result['code']):
+        fragments = list(dict.fromkeys(fragments or []))
+        if fragments != split(*case):
+            print(f'fragments.py: {case!r}: {fragments!r} != {split(*case)!r}', file=sys.stderr)
+            failed = True
+    for url, text in zip(urls, result['urls']):
+        if text is not False and text != html.unescape(urllib.parse.unquote(url)):
+            print(f'fragments.py: {url!r}: {text!r} != {html.unescape(urllib.parse.unquote(url))!r}',
+                  file=sys.stderr)
+            failed = True
+
+    # Not just the cases that `unquote` is unsure of, nor only the ones above.
+    decoded = sum(text is not False for text in result['urls'])
+    print(f'fragments.py: {len(code)} code elements, {len(urls)} substitutions, {decoded} decoded in Lua')
+    if failed or len(code) == len(CODE) or len(urls) == len(URLS) or decoded == 0:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
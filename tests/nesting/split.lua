@@ -0,0 +1,36 @@
+-- MPark.WG21
+--
+-- Copyright Michael Park, 2026
+--
+-- Distributed under the Boost Software License, Version 1.0.
+-- (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+--[[
+Run `split` and `unquote` of `fragments.lua` on the cases of `fragments.py`.
+
+Usage: pandoc lua split.lua FRAGMENTS_LUA < CASES
+
+CASES is a JSON object with `code`, a list of `[text, md, em]`, the delimiters
+`null` if there are none, and `urls`, a list of URLs. The result is the same
+object with the fragments of each code text, and the text of each URL or
+`false` where `unquote` is unsure.
+]]
+
+local path = arg[1]
+local f = assert(io.open(path, 'r'))
+-- The chunk returns its locals, which a filter has no other way to expose.
+local fragments = assert(load(
+  f:read('a') .. '\nreturn {split = split, unquote = unquote}', '@' .. path))()
+f:close()
+
+local cases = pandoc.json.decode(io.read('a'), false)
+local result = {code = {}, urls = {}}
+for i, case in ipairs(cases.code) do
+  local text, md, em = case[1], case[2], case[3]
+  result.code[i] = fragments.split(
+    text, md ~= pandoc.json.null and md or nil, em ~= pandoc.json.null and em or nil)
+end
+for i, url in ipairs(cases.urls) do
+  result.urls[i] = fragments.unquote(url) or false
+end
+io.write(pandoc.json.encode(result))
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+# MPark.WG21
+#
+# Copyright Michael Park, 2026
+#
+# Distributed under the Boost Software License, Version 1.0.
+# (See accompanying file LICENSE.md or copy at http://boost.org/LICENSE_1_0.txt)
+
+"""
+Test the resource cache against a local HTTP server.
+
+Usage: resource_cache.py OUTDIR
+
+Builds papers with remote images served from a local HTTP server into OUTDIR
+with `RESOURCE_CACHE` set, and checks that:
+
+  - The first build fetches the images, and embeds them.
+  - A rebuild doesn't make any requests while the images are fresh.
+  - Once they expire, they're revalidated rather than downloaded again.
+  - With the server gone, the build uses the stale images.
+  - Over `RESOURCE_CACHE_SIZE`, the least recently used images are evicted.
+"""
+
+import http.server
+import json
+import os
+import os.path
+import subprocess
+import sys
+import threading
+
+ROOTDIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A 1x1 transparent PNG.
+PNG = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082')
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg" width="1" height="1"/>'
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    requests = []
+    resources = {
+        '/image.png': ('image/png', PNG),
+        '/other.svg': ('image/svg+xml', SVG),
+        '/large.png': ('image/png', PNG + b'\0' * 4096),
+    }
+
+    def do_GET(self):
+        content_type, content = self.resources[self.path]
+        etag = f'"{len(content)}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.requests.append((self.path, 304))
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.requests.append((self.path, 200))
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'max-age=3600')
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+def main():
+    outdir, = sys.argv[1:]
+    subprocess.run(['rm', '-rf', outdir], check=True)
+    os.makedirs(outdir)
+    cache = os.path.join(outdir, 'cache')
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    header = '---\ntitle: "Resource Cache Test"\ndocument: D0000R0\ndate: 2026-01-01\n---\n\n'
+    with open(os.path.join(outdir, 'images.md'), 'w') as f:
+        f.write(f'{header}![]({url}/image.png)\n\n<img src="{url}/other.svg" />\n')
+    with open(os.path.join(outdir, 'large.md'), 'w') as f:
+        f.write(f'{header}![]({url}/large.png)\n')
+
+    failed = []
+    def check(what, condition):
+        print(f'{"  ok" if condition else "FAIL"} {what}')
+        if not condition:
+            failed.append(what)
+
+    def build(target, *args):
+        Handler.requests.clear()
+        # The output may be up to date with its dependencies, but not the test.
+        path = os.path.join(outdir, 'out', target)
+        if os.path.exists(path):
+            os.remove(path)
+        subprocess.run(
+            ['make', '-s', '-f', os.path.join(ROOTDIR, 'flat.mk'), 'OUTDIR=out',
+             'RESOURCE_CACHE=cache', *args, target],
+            cwd=outdir, check=True)
+        with open(path, 'r') as f:
+            html = f.read()
+        return sorted(Handler.requests), html
+
+    def expire():
+        with open(os.path.join(cache, 'index.json'), 'r') as f:
+            index = json.load(f)
+        for entry in index.values():
+            entry['expires'] = 0
+        with open(os.path.join(cache, 'index.json'), 'w') as f:
+            json.dump(index, f)
+
+    requests, html = build('images.html')
+    check('first build fetches the images',
+          requests == [('/image.png', 200), ('/other.svg', 200)])
+    check('first build embeds the images',
+          'data:image/png;base64' in html and 'data:image/svg+xml' in html and url not in html)
+
+    requests, html = build('images.html')
+    check('rebuild makes no requests', requests == [])
+    check('rebuild embeds the images', 'data:image/png;base64' in html and url not in html)
+
+    expire()
+    requests, html = build('images.html')
+    check('expired images are revalidated',
+          requests == [('/image.png', 304), ('/other.svg', 304)])
+
+    expire()
+    server.shutdown()
+    server.server_close()
+    requests, html = build('images.html')
+    check('offline build uses the stale images',
+          'data:image/png;base64' in html and url not in html)
+
+    # The limit fits the images of one of the papers, but not of both.
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', int(url.rsplit(':', 1)[1])), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    requests, html = build('large.html', 'RESOURCE_CACHE_SIZE=0.004')
+    with open(os.path.join(cache, 'index.json'), 'r') as f:
+        urls = sorted(json.load(f))
+    check('least recently used images are evicted over the limit',
+          urls == [f'{url}/large.png'] and len(os.listdir(os.path.join(cache, 'objects'))) == 1)
+    server.shutdown()
+    server.server_close()
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()